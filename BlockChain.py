@@ -1,52 +1,423 @@
 import hashlib
+import os
+import sys
 import time
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 import tkinter as tk
-from tkinter import messagebox, scrolledtext
+from tkinter import messagebox, scrolledtext, ttk
+
+from BlockStore import BlockStore
+from ChainIndex import InvertedIndex
+from Mempool import Mempool
+from MerkleTree import MerkleTree, verify_proof
+from ProofOfWork import Miner, adjust_difficulty, meets_difficulty
 
 class Block:
-    def __init__(self, index, previous_hash, timestamp, data, hash):
+    """A block header plus its list of transactions; the hash covers the Merkle root, not the transactions"""
+
+    def __init__(self, index, previous_hash, timestamp, data, hash, merkle_root, nonce=0, difficulty=0):
         self.index = index
         self.previous_hash = previous_hash
         self.timestamp = timestamp
         self.data = data
         self.hash = hash
+        self.merkle_root = merkle_root
+        self.nonce = nonce
+        self.difficulty = difficulty
+        self._tree = None
+
+    @property
+    def merkle_tree(self):
+        """Built on first use, for producing inclusion proofs"""
+        if self._tree is None:
+            self._tree = MerkleTree(self.data)
+        return self._tree
+
+def header_prefix(index, previous_hash, timestamp, merkle_root, difficulty=0):
+    """Header bytes hashed ahead of the nonce; unmined blocks (difficulty 0) have no nonce"""
+    prefix = f"{index}{previous_hash}{timestamp}{merkle_root}"
+    return (f"{prefix}|{difficulty}|" if difficulty else prefix).encode()
+
+
+ROW_HEADER = f"{'Index':<6} | {'Previous Hash':<66} | {'Timestamp':<25} | {'Data':<40} | {'Hash'}"
+
+
+def format_row(block, data_width=None):
+    """One line of the chain table; data_width cuts the transaction list short for previews"""
+    if data_width is None:
+        data = ', '.join(block.data)
+    else:
+        data = ', '.join(block.data[:data_width // 2])
+        data = data if len(data) <= data_width else data[:data_width - 3] + "..."
+    return f"{block.index:<6} | {block.previous_hash:<66} | {block.timestamp:<25} | {data:<40} | {block.hash}"
+
+
+def hash_header(index, previous_hash, timestamp, merkle_root, difficulty=0, nonce=0):
+    value = header_prefix(index, previous_hash, timestamp, merkle_root, difficulty)
+    if difficulty:
+        value += str(nonce).encode()
+    return hashlib.sha256(value).hexdigest()
+
+
+def _check_blocks(rows, min_difficulty=0, mined_from=0):
+    """Return the height of the first row whose contents don't match its stored root and hash, or None
+
+    Rows at height mined_from or above must also declare at least
+    min_difficulty. Module level, and fed plain tuples, so it also runs in a
+    ProcessPoolExecutor.
+    """
+    for index, previous_hash, timestamp, data, root, hash, difficulty, nonce in rows:
+        if MerkleTree(data).root != root or not meets_difficulty(hash, difficulty) \
+                or (index >= mined_from and difficulty < min_difficulty) \
+                or hash_header(index, previous_hash, timestamp, root, difficulty, nonce) != hash:
+            return index
+    return None
+
 
 class Blockchain:
-    def __init__(self):
-        self.chain = []
-        self.transaction_pool = []
-        self.create_block(data="Genesis Block", previous_hash='-1')
+    """The chain lives in memory, or in a BlockStore under directory when one is given
+
+    With proof_of_work set, every new block is mined at the current difficulty
+    (leading zero bits of its hash) on a pool of workers processes, and the
+    difficulty is retuned after each block so mining takes about
+    target_block_time seconds, but never below min_difficulty. Validation then
+    rejects blocks from height mined_from on that declare less than
+    min_difficulty, so a rewritten block can't be re-mined at difficulty 0.
+    mined_from defaults to the height of the first block mined here; pass it
+    when reopening a stored chain that was mined.
+
+    Pending transactions wait in transaction_pool, a Mempool; blocks built
+    from it take at most max_block_bytes of transactions, highest priority
+    first.
+    """
+
+    def __init__(self, directory=None, proof_of_work=False, difficulty=16, target_block_time=2.0, workers=None,
+                 mempool=None, max_block_bytes=1_000_000, min_difficulty=8, mined_from=None, **store_options):
+        self.chain = [] if directory is None else BlockStore(directory, Block, **store_options)
+        if mempool is None:
+            mempool = Mempool(max_transaction_bytes=max_block_bytes)
+        self.transaction_pool = mempool
+        self.max_block_bytes = max_block_bytes
+        self.proof_of_work = proof_of_work
+        self.min_difficulty = min_difficulty
+        self.mined_from = mined_from
+        self.difficulty = max(difficulty, min_difficulty)
+        self.target_block_time = target_block_time
+        self.workers = workers
+        self.mining_times = deque(maxlen=10)
+        self.last_mining = None
+        self._miner = None
+        # Blocks up to verified_height passed validation while the block there had verified_hash.
+        self.verified_height = -1
+        self.verified_hash = None
+        self.text_index = InvertedIndex()
+        self._heights_by_hash = {}
+        if not self.chain:
+            self.create_block(data=["Genesis Block"], previous_hash='-1')
 
     def create_block(self, data, previous_hash=None):
+        """Append a block holding the transactions in data (a single string counts as one)"""
+        if isinstance(data, str):
+            data = [data]
+        data = list(data)
+        if previous_hash is None:
+            previous_hash = self.chain[-1].hash if self.chain else '-1'
         index = len(self.chain)
         timestamp = time.time()
-        hash = self.hash_block(index, previous_hash, timestamp, data)
-        block = Block(index, previous_hash, timestamp, data, hash)
+        tree = MerkleTree(data)
+        difficulty = nonce = 0
+        if self.proof_of_work:
+            difficulty = self.difficulty
+            if self.mined_from is None:
+                self.mined_from = index
+            nonce = self._mine(header_prefix(index, previous_hash, timestamp, tree.root, difficulty), difficulty)
+        hash = self.hash_block(index, previous_hash, timestamp, tree.root, difficulty, nonce)
+        block = Block(index, previous_hash, timestamp, data, hash, tree.root, nonce, difficulty)
+        block._tree = tree
         self.chain.append(block)
         return block
 
-    def hash_block(self, index, previous_hash, timestamp, data):
-        value = f"{index}{previous_hash}{timestamp}{data}".encode()
-        return hashlib.sha256(value).hexdigest()
+    def hash_block(self, index, previous_hash, timestamp, merkle_root, difficulty=0, nonce=0):
+        return hash_header(index, previous_hash, timestamp, merkle_root, difficulty, nonce)
 
-    def display_chain(self):
-        blockchain_str = f"{'Index':<6} | {'Previous Hash':<66} | {'Timestamp':<25} | {'Data':<40} | {'Hash'}\n"
-        blockchain_str += "-" * 200 + "\n"
+    def _mine(self, prefix, difficulty):
+        if self._miner is None:
+            self._miner = Miner(self.workers)
+        nonce, attempts, seconds = self._miner.mine(prefix, difficulty)
+        self.mining_times.append(seconds)
+        self.last_mining = {
+            "difficulty": difficulty,
+            "attempts": attempts,
+            "seconds": seconds,
+            "hashes_per_second": attempts / seconds if seconds else float('inf'),
+        }
+        self.difficulty = adjust_difficulty(difficulty, self.mining_times, self.target_block_time,
+                                            min_difficulty=self.min_difficulty)
+        return nonce
+
+    def close(self):
+        if self._miner is not None:
+            self._miner.close()
+            self._miner = None
+        if isinstance(self.chain, BlockStore):
+            self.chain.close()
+
+    def first_invalid_block(self, full=False, workers=None, chunk_size=256, executor=None):
+        """Return the height of the first block that fails validation, or None if the chain is valid
+
+        Each block's Merkle root and hash are re-derived from its contents and
+        its previous_hash must equal the hash of the block before it. While
+        proof_of_work is set, blocks from mined_from on must declare at least
+        min_difficulty. Blocks are
+        hashed in chunks of chunk_size on a thread pool of workers threads
+        (default os.cpu_count()); pass an executor, thread or process, to reuse
+        one. Unless full is set, only blocks after the last verified height are
+        checked, as long as the block at that height is unchanged.
+        """
+        start = 0
+        if not full and 0 <= self.verified_height < len(self.chain) \
+                and self.chain[self.verified_height].hash == self.verified_hash:
+            start = self.verified_height + 1
+        bad = self._first_broken_link(start)
+        end = len(self.chain) if bad is None else bad
+        rows = [(block.index, block.previous_hash, block.timestamp, block.data, block.merkle_root, block.hash,
+                 block.difficulty, block.nonce) for block in self.chain[start:end]]
+        chunks = [rows[i:i + chunk_size] for i in range(0, len(rows), chunk_size)]
+        check = _check_blocks
+        if self.proof_of_work and self.mined_from is not None:
+            check = partial(_check_blocks, min_difficulty=self.min_difficulty, mined_from=self.mined_from)
+        if len(chunks) <= 1 or workers == 1:
+            results = map(check, chunks)
+        else:
+            pool = executor or ThreadPoolExecutor(max_workers=workers or os.cpu_count())
+            try:
+                results = list(pool.map(check, chunks))
+            finally:
+                if executor is None:
+                    pool.shutdown()
+        for result in results:
+            if result is not None:
+                bad = result
+                break
+        verified = len(self.chain) - 1 if bad is None else bad - 1
+        self.verified_height = verified
+        self.verified_hash = self.chain[verified].hash if verified >= 0 else None
+        return bad
+
+    def is_valid(self, **options):
+        return self.first_invalid_block(**options) is None
+
+    def _first_broken_link(self, start):
+        for height in range(start, len(self.chain)):
+            block = self.chain[height]
+            expected = self.chain[height - 1].hash if height else '-1'
+            if block.index != height or block.previous_hash != expected:
+                return height
+        return None
 
+    def transaction_proof(self, height, position):
+        """Merkle proof that chain[height].data[position] is in that block"""
+        return self.chain[height].merkle_tree.proof(position)
+
+    def verify_transaction(self, height, transaction, proof):
+        """Check a transaction against a block using only its header and an O(log n) proof"""
+        if not 0 <= height < len(self.chain):
+            return False
+        block = self.chain[height]
+        header_hash = self.hash_block(block.index, block.previous_hash, block.timestamp, block.merkle_root,
+                                      block.difficulty, block.nonce)
+        return header_hash == block.hash and verify_proof(transaction, proof, block.merkle_root)
+
+    def find_transaction(self, transaction):
+        """Return (height, position) of the first block holding transaction, or None"""
         for block in self.chain:
-            blockchain_str += f"{block.index:<6} | {block.previous_hash:<66} | {block.timestamp:<25} | {block.data:<40} | {block.hash}\n"
+            try:
+                return block.index, block.data.index(transaction)
+            except ValueError:
+                pass
+        return None
+
+    def blocks(self, start=0, stop=None, reverse=False):
+        """Yield the blocks with start <= height < stop, lowest first unless reverse"""
+        stop = len(self.chain) if stop is None else min(stop, len(self.chain))
+        heights = range(stop - 1, max(start, 0) - 1, -1) if reverse else range(max(start, 0), stop)
+        for height in heights:
+            yield self.chain[height]
+
+    def block_by_hash(self, block_hash):
+        """The block with the given hash, or None"""
+        if isinstance(self.chain, BlockStore):
+            return self.chain.get_by_hash(block_hash)
+        for height in range(len(self._heights_by_hash), len(self.chain)):
+            self._heights_by_hash[self.chain[height].hash] = height
+        height = self._heights_by_hash.get(block_hash)
+        return None if height is None else self.chain[height]
 
-        return blockchain_str
+    def search_heights(self, query):
+        """Yield, lowest first, the heights of blocks whose transactions contain every word of query
+
+        Blocks are added to the inverted index the first time a search runs
+        after they were appended.
+        """
+        index = self.text_index
+        for block in self.blocks(index.next_height):
+            index.add(block.index, block.data)
+        return index.search(query)
+
+    def search(self, query):
+        for height in self.search_heights(query):
+            yield self.chain[height]
+
+    def display_chain(self):
+        rows = [ROW_HEADER, "-" * 200]
+        rows.extend(map(format_row, self.chain))
+        return "\n".join(rows) + "\n"
 
-    def add_transaction(self, data):
-        self.transaction_pool.append(data)
+    def add_transaction(self, data, priority=0):
+        """Queue a transaction
+
+        Returns False if it is already pending, larger than max_block_bytes, or
+        turned away by a full pool.
+        """
+        return self.transaction_pool.add_transaction(data, priority)
+
+    def add_transactions(self, batch, priority=0):
+        return self.transaction_pool.add_transactions(batch, priority)
+
+    def create_block_from_pool(self, previous_hash=None, max_transactions=None):
+        """Build a block from the highest-priority pending transactions that fit max_block_bytes
+
+        Whatever doesn't fit stays pooled for the next block. Returns None if
+        the pool is empty.
+        """
+        transactions = self.transaction_pool.take(max_transactions, self.max_block_bytes)
+        if not transactions:
+            return None
+        return self.create_block(transactions, previous_hash)
+
+    def display_transaction_pool(self, limit=1000):
+        if not self.transaction_pool:
+            return "No transactions in the pool."
+        shown = "\n".join(self.transaction_pool.head(limit))
+        hidden = len(self.transaction_pool) - limit
+        return shown + (f"\n... and {hidden:,} more" if hidden > 0 else "")
+
+class ChainViewer(tk.Frame):
+    """Chain table that only ever formats the rows on screen
+
+    Scrolling, searching and jumping to a block each fetch one page of
+    blocks through the Blockchain query API, so the cost of a redraw doesn't
+    depend on the length of the chain.
+    """
+    ROWS = 15
+
+    def __init__(self, root, blockchain):
+        super().__init__(root, bg="#f0f0f0")
+        self.blockchain = blockchain
+        self._first_row = 0
+        self._results = None  # heights matching the current search, or None for the whole chain
+
+        search_frame = tk.Frame(self, bg="#f0f0f0")
+        search_frame.pack(fill=tk.X, pady=(0, 5))
+        tk.Label(search_frame, text="Search transactions or go to height/hash:", bg="#f0f0f0").pack(side=tk.LEFT, padx=5)
+        self.query_entry = tk.Entry(search_frame, width=50)
+        self.query_entry.pack(side=tk.LEFT, padx=5)
+        self.query_entry.bind("<Return>", lambda e: self.search())
+        tk.Button(search_frame, text="Search", command=self.search, bg="#2196F3", fg="white").pack(side=tk.LEFT, padx=5)
+        tk.Button(search_frame, text="Go To", command=self.go_to, bg="#2196F3", fg="white").pack(side=tk.LEFT, padx=5)
+        tk.Button(search_frame, text="Show All", command=self.show_all, bg="#9E9E9E", fg="white").pack(side=tk.LEFT,
+                                                                                                       padx=5)
+
+        table_frame = tk.Frame(self)
+        table_frame.pack()
+        self.text = tk.Text(table_frame, width=120, height=self.ROWS + 2, font=("Courier New", 10), wrap=tk.NONE)
+        self.scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self._on_scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.text.pack(side=tk.TOP)
+        xscroll = ttk.Scrollbar(table_frame, orient=tk.HORIZONTAL, command=self.text.xview)
+        xscroll.pack(side=tk.BOTTOM, fill=tk.X)
+        self.text.configure(xscrollcommand=xscroll.set)
+        self.text.bind("<MouseWheel>", lambda e: self._scroll_rows(-3 if e.delta > 0 else 3))
+        self.text.bind("<Button-4>", lambda e: self._scroll_rows(-3))
+        self.text.bind("<Button-5>", lambda e: self._scroll_rows(3))
+
+        self.status = tk.Label(self, text="", bg="#f0f0f0")
+        self.status.pack(anchor=tk.W)
+        self.refresh()
+
+    def _total(self):
+        return len(self.blockchain.chain) if self._results is None else len(self._results)
+
+    def _page(self):
+        if self._results is None:
+            return self.blockchain.blocks(self._first_row, self._first_row + self.ROWS)
+        return (self.blockchain.chain[height] for height in self._results[self._first_row:self._first_row + self.ROWS])
+
+    def refresh(self):
+        total = self._total()
+        self._first_row = max(0, min(self._first_row, total - self.ROWS))
+        rows = [ROW_HEADER, "-" * 200]
+        rows.extend(format_row(block, data_width=40) for block in self._page())
+        self.text.configure(state=tk.NORMAL)
+        self.text.delete(1.0, tk.END)
+        self.text.insert(tk.END, "\n".join(rows))
+        self.text.configure(state=tk.DISABLED)
+        last = min(self._first_row + self.ROWS, total)
+        if total > self.ROWS:
+            self.scrollbar.set(self._first_row / total, last / total)
+        else:
+            self.scrollbar.set(0, 1)
+        what = "blocks" if self._results is None else "matching blocks"
+        self.status.config(text=f"{what} {self._first_row + 1}-{last} of {total:,}" if total else f"no {what}")
+
+    def search(self):
+        query = self.query_entry.get().strip()
+        if not query:
+            self.show_all()
+            return
+        self._results = array('q', self.blockchain.search_heights(query))
+        self._first_row = 0
+        self.refresh()
+
+    def go_to(self):
+        query = self.query_entry.get().strip()
+        if query.isdigit() and len(query) < 64:  # a 64-digit query is a hash that happens to be all digits
+            height = int(query)
+        else:
+            block = self.blockchain.block_by_hash(query)
+            height = None if block is None else block.index
+        if height is None or height >= len(self.blockchain.chain):
+            messagebox.showwarning("Not Found", f"No block with height or hash {query!r}.")
+            return
+        self._results = None
+        self._first_row = height
+        self.refresh()
+
+    def show_all(self):
+        self._results = None
+        self.refresh()
+
+    def _scroll_rows(self, delta):
+        self._first_row = max(0, self._first_row + delta)
+        self.refresh()
+
+    def _on_scroll(self, action, amount, unit=None):
+        if action == tk.MOVETO:
+            self._first_row = int(float(amount) * self._total())
+        elif unit == tk.PAGES:
+            self._first_row += int(amount) * self.ROWS
+        else:
+            self._first_row += int(amount)
+        self._first_row = max(0, self._first_row)
+        self.refresh()
 
-    def display_transaction_pool(self):
-        return "\n".join(self.transaction_pool) if self.transaction_pool else "No transactions in the pool."
 
 class BlockchainApp:
-    def __init__(self, root):
-        self.blockchain = Blockchain()
+    def __init__(self, root, directory=None):
+        self.blockchain = Blockchain(directory)
         self.root = root
         self.root.title("Simple Blockchain")
         self.root.geometry("1100x700")  # Set window size
@@ -82,12 +453,21 @@ class BlockchainApp:
         self.add_block_button = tk.Button(root, text="Add Block", command=self.add_block, bg="#FF9800", fg="white")
         self.add_block_button.pack(pady=10)
 
+        self.proof_of_work = tk.BooleanVar(value=self.blockchain.proof_of_work)
+        self.proof_of_work_check = tk.Checkbutton(root, text="Mine blocks (proof of work)", variable=self.proof_of_work,
+                                                  command=self.toggle_proof_of_work, bg="#f0f0f0")
+        self.proof_of_work_check.pack()
+
         self.view_button = tk.Button(root, text="View Blockchain", command=self.view_blockchain, bg="#2196F3",
                                      fg="white")
         self.view_button.pack(pady=10)
 
-        self.output_area = scrolledtext.ScrolledText(root, width=120, height=15, font=("Courier New", 10))
-        self.output_area.pack(pady=10)
+        self.validate_button = tk.Button(root, text="Validate Chain", command=self.validate_chain, bg="#9C27B0",
+                                         fg="white")
+        self.validate_button.pack(pady=10)
+
+        self.viewer = ChainViewer(root, self.blockchain)
+        self.viewer.pack(pady=10)
 
         self.transaction_area = scrolledtext.ScrolledText(root, width=120, height=10, font=("Courier New", 10))
         self.transaction_area.pack(pady=10)
@@ -97,8 +477,11 @@ class BlockchainApp:
     def add_transaction(self):
         data = self.data_entry.get()
         if data:
-            self.blockchain.add_transaction(data)
-            messagebox.showinfo("Success", "Transaction added successfully!")
+            if self.blockchain.add_transaction(data):
+                messagebox.showinfo("Success", "Transaction added successfully!")
+            else:
+                messagebox.showwarning("Not Added",
+                                       "That transaction is already pending, larger than a block, or the pool is full.")
             self.data_entry.delete(0, tk.END)
             self.update_transaction_area()
         else:
@@ -113,16 +496,34 @@ class BlockchainApp:
             return
 
         previous_hash = self.blockchain.chain[-1].hash if self.blockchain.chain else '-1'
-        data = ', '.join(self.blockchain.transaction_pool)
-        self.blockchain.create_block(data, previous_hash)
-        messagebox.showinfo("Success", "Block added successfully!")
-        self.blockchain.transaction_pool.clear()
+        block = self.blockchain.create_block_from_pool(previous_hash)
+        if block is None:
+            messagebox.showwarning("Block Not Added", f"No pending transaction fits within the block size limit of "
+                                                      f"{self.blockchain.max_block_bytes:,} bytes.")
+            return
+        mining = self.blockchain.last_mining
+        if self.blockchain.proof_of_work and mining:
+            messagebox.showinfo("Success", f"Block mined at difficulty {mining['difficulty']} in {mining['seconds']:.2f}s "
+                                           f"({mining['attempts']:,} hashes, {mining['hashes_per_second']:,.0f} H/s). "
+                                           f"Next difficulty: {self.blockchain.difficulty}.")
+        else:
+            messagebox.showinfo("Success", f"Block added with {len(block.data)} transactions; "
+                                           f"{len(self.blockchain.transaction_pool)} still pending.")
         self.update_transaction_area()
 
     def view_blockchain(self):
-        blockchain_str = self.blockchain.display_chain()
-        self.output_area.delete(1.0, tk.END)
-        self.output_area.insert(tk.END, blockchain_str)
+        self.viewer.refresh()
+
+    def toggle_proof_of_work(self):
+        self.blockchain.proof_of_work = self.proof_of_work.get()
+
+    def validate_chain(self):
+        bad = self.blockchain.first_invalid_block()
+        if bad is None:
+            messagebox.showinfo("Valid", f"All {len(self.blockchain.chain)} blocks are valid.")
+        else:
+            messagebox.showerror("Invalid", f"Block {bad} failed validation: its contents or its link to the previous block "
+                                            f"changed, or it was not mined at the minimum difficulty.")
 
     def update_transaction_area(self):
         self.transaction_area.delete(1.0, tk.END)
@@ -131,5 +532,7 @@ class BlockchainApp:
 
 if __name__ == "__main__":
     root = tk.Tk()
-    app = BlockchainApp(root)
+    # Optional argument: a directory to keep the chain in between runs.
+    app = BlockchainApp(root, sys.argv[1] if len(sys.argv) > 1 else None)
     root.mainloop()
+    app.blockchain.close()
@@ -0,0 +1,238 @@
+"""Append-only on-disk storage for blocks.
+
+Blocks are appended as records to numbered segment files:
+
+    magic (4) | payload length (4) | CRC32 of payload (4) | block hash (32) | payload (JSON)
+
+An index file holds one fixed-size entry per height, (segment, offset, block
+hash), and is written after the record it points to. Segment files are the
+source of truth: on open, index entries whose records are missing or corrupt
+are dropped, records the index hasn't caught up with are re-indexed, and a
+torn record at the end of the last segment is truncated away.
+
+Nothing is deserialized on open. Records and index entries are read through
+read-only memory maps and decoded one block at a time, with recently read
+blocks kept in an LRUCache. The hash -> height map is built on the first
+lookup by hash.
+"""
+import json
+import mmap
+import os
+import struct
+import zlib
+
+from LRU import MISS, LRUCache
+
+_RECORD_MAGIC = b'BLK1'
+_RECORD = struct.Struct('<4sII32s')  # magic, payload length, payload CRC32, block hash
+_ENTRY = struct.Struct('<IQ32s')  # segment number, record offset, block hash
+_SEGMENT_NAME = "blocks-{:06d}.seg"
+_INDEX_NAME = "index"
+
+
+class _Mapping:
+    """Read-only mmap of a growing file, remapped when a read goes past the mapped end"""
+
+    def __init__(self, path):
+        self.path = path
+        self.map = None
+
+    def view(self, end):
+        if self.map is None or len(self.map) < end:
+            self.close()
+            with open(self.path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size < end:
+                    raise EOFError(f"{self.path} ends at {size}, before {end}")
+                self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self.map
+
+    def close(self):
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+
+
+class BlockStore:
+    """Persistent, append-only sequence of blocks stored under directory
+
+    Supports len(), indexing by height (including negative heights and
+    slices), iteration and append(block). factory(index, previous_hash,
+    timestamp, data, hash, merkle_root, nonce, difficulty) builds the objects
+    handed back.
+    """
+
+    def __init__(self, directory, factory=tuple, segment_size=64 * 2**20, fsync=True, cache_size=1024):
+        self.directory = directory
+        self.factory = factory
+        self.segment_size = segment_size
+        self.fsync = fsync
+        self._cache = LRUCache(cache_size)
+        self._by_hash = None
+        self._segments = {}
+        os.makedirs(directory, exist_ok=True)
+        self._recover()
+
+    # -- recovery ---------------------------------------------------------
+
+    def _segment_path(self, segment):
+        return os.path.join(self.directory, _SEGMENT_NAME.format(segment))
+
+    def _segment_numbers(self):
+        numbers = []
+        for name in os.listdir(self.directory):
+            if name.startswith("blocks-") and name.endswith(".seg"):
+                numbers.append(int(name[7:-4]))
+        return sorted(numbers)
+
+    def _read_record(self, f, offset):
+        """Return (hash, record length) of a complete, intact record at offset, else None"""
+        f.seek(offset)
+        header = f.read(_RECORD.size)
+        if len(header) < _RECORD.size:
+            return None
+        magic, length, crc, digest = _RECORD.unpack(header)
+        payload = f.read(length)
+        if magic != _RECORD_MAGIC or len(payload) < length or zlib.crc32(payload) != crc:
+            return None
+        return digest, _RECORD.size + length
+
+    def _recover(self):
+        index_path = os.path.join(self.directory, _INDEX_NAME)
+        with open(index_path, 'ab+') as index:
+            count = index.seek(0, os.SEEK_END) // _ENTRY.size
+
+            # Drop index entries that point at missing or damaged records.
+            segment, end = 0, 0
+            while count:
+                index.seek((count - 1) * _ENTRY.size)
+                number, offset, digest = _ENTRY.unpack(index.read(_ENTRY.size))
+                try:
+                    with open(self._segment_path(number), 'rb') as f:
+                        record = self._read_record(f, offset)
+                except FileNotFoundError:
+                    record = None
+                if record is not None and record[0] == digest:
+                    segment, end = number, offset + record[1]
+                    break
+                count -= 1
+
+        # Index records written after the last indexed one; cut off a torn tail.
+        missing = []
+        numbers = [n for n in self._segment_numbers() if n >= segment] or [segment]
+        for number in numbers:
+            if number != segment:
+                segment, end = number, 0
+            with open(self._segment_path(segment), 'ab+') as f:
+                while True:
+                    record = self._read_record(f, end)
+                    if record is None:
+                        break
+                    missing.append(_ENTRY.pack(segment, end, record[0]))
+                    end += record[1]
+                damaged = f.seek(0, os.SEEK_END) > end
+            if damaged:
+                os.truncate(self._segment_path(segment), end)
+                for later in numbers[numbers.index(number) + 1:]:
+                    os.remove(self._segment_path(later))
+                break
+
+        with open(index_path, 'rb+') as index:
+            index.truncate(count * _ENTRY.size)
+            index.seek(count * _ENTRY.size)
+            index.write(b''.join(missing))
+            self._sync(index)
+        self._count = count + len(missing)
+        self._segment, self._end = segment, end
+        self._index = _Mapping(index_path)
+
+    # -- reading ----------------------------------------------------------
+
+    def __len__(self):
+        return self._count
+
+    def _entry(self, height):
+        end = (height + 1) * _ENTRY.size
+        return _ENTRY.unpack_from(self._index.view(end), end - _ENTRY.size)
+
+    def _mapping(self, segment):
+        mapping = self._segments.get(segment)
+        if mapping is None:
+            mapping = self._segments[segment] = _Mapping(self._segment_path(segment))
+        return mapping
+
+    def _load(self, height):
+        segment, offset, _ = self._entry(height)
+        mapping = self._mapping(segment)
+        view = mapping.view(offset + _RECORD.size)
+        _, length, _, _ = _RECORD.unpack_from(view, offset)
+        start = offset + _RECORD.size
+        view = mapping.view(start + length)
+        return self.factory(*json.loads(view[start:start + length]))
+
+    def __getitem__(self, height):
+        if isinstance(height, slice):
+            return [self[i] for i in range(*height.indices(self._count))]
+        if height < 0:
+            height += self._count
+        if not 0 <= height < self._count:
+            raise IndexError("block height out of range")
+        block = self._cache.get(height)
+        if block is MISS:
+            block = self._load(height)
+            self._cache.put(height, block)
+        return block
+
+    def __iter__(self):
+        for height in range(self._count):
+            yield self[height]
+
+    def height_of(self, block_hash):
+        """Height of the block with the given hex hash, or None"""
+        if self._by_hash is None:
+            view = self._index.view(self._count * _ENTRY.size) if self._count else b''
+            self._by_hash = {
+                _ENTRY.unpack_from(view, height * _ENTRY.size)[2]: height for height in range(self._count)
+            }
+        try:
+            return self._by_hash.get(bytes.fromhex(block_hash))
+        except ValueError:
+            return None
+
+    def get_by_hash(self, block_hash):
+        height = self.height_of(block_hash)
+        return None if height is None else self[height]
+
+    # -- writing ----------------------------------------------------------
+
+    def append(self, block):
+        if block.index != self._count:
+            raise ValueError(f"Expected a block at height {self._count}, got {block.index}")
+        payload = json.dumps([block.index, block.previous_hash, block.timestamp, block.data, block.hash,
+                              block.merkle_root, block.nonce, block.difficulty], separators=(',', ':')).encode()
+        digest = bytes.fromhex(block.hash)
+        record = _RECORD.pack(_RECORD_MAGIC, len(payload), zlib.crc32(payload), digest) + payload
+        if self._end and self._end + len(record) > self.segment_size:
+            self._segment, self._end = self._segment + 1, 0
+        with open(self._segment_path(self._segment), 'ab') as f:
+            f.write(record)
+            self._sync(f)
+        with open(os.path.join(self.directory, _INDEX_NAME), 'ab') as f:
+            f.write(_ENTRY.pack(self._segment, self._end, digest))
+            self._sync(f)
+        self._end += len(record)
+        if self._by_hash is not None:
+            self._by_hash[digest] = self._count
+        self._cache.put(self._count, block)
+        self._count += 1
+
+    def _sync(self, f):
+        if self.fsync:
+            f.flush()
+            os.fsync(f.fileno())
+
+    def close(self):
+        self._index.close()
+        for mapping in self._segments.values():
+            mapping.close()
+        self._segments.clear()
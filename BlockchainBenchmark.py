@@ -0,0 +1,107 @@
+import argparse
+import hashlib
+import time
+
+from BlockChain import header_prefix
+from Mempool import Mempool
+from ProofOfWork import Miner, target
+
+
+def _naive_hashes(prefix, count):
+    """Hash the whole header for every nonce, as a baseline for the copied prefix state"""
+    goal = target(255)
+    for nonce in range(count):
+        if hashlib.sha256(prefix + str(nonce).encode()).digest() < goal:
+            break
+
+
+def _copied_hashes(prefix, count):
+    goal = target(255)
+    base = hashlib.sha256(prefix)
+    for nonce in range(count):
+        h = base.copy()
+        h.update(str(nonce).encode())
+        if h.digest() < goal:
+            break
+
+
+def run_mining(args):
+    prefix = header_prefix(1, "0" * 64, time.time(), "f" * 64, args.difficulty)
+    print(f"header prefix: {len(prefix)} bytes")
+    for name, fn in (("full header per attempt", _naive_hashes), ("sha256().copy() of prefix", _copied_hashes)):
+        began = time.perf_counter()
+        fn(prefix, args.hashes)
+        seconds = time.perf_counter() - began
+        print(f"{name:<26} {args.hashes / seconds:>12,.0f} H/s")
+    print()
+    print(f"{'workers':>7} | {'difficulty':>10} | {'blocks':>6} | {'seconds/block':>13} | {'H/s':>12}")
+    print("-" * 62)
+    for workers in args.workers:
+        with Miner(workers) as miner:
+            attempts = seconds = 0
+            for block in range(args.blocks):
+                _, tried, took = miner.mine(prefix + f"{block}|".encode(), args.difficulty)
+                attempts += tried
+                seconds += took
+            print(f"{workers:>7} | {args.difficulty:>10} | {args.blocks:>6} | {seconds / args.blocks:>13.3f} | "
+                  f"{attempts / seconds:>12,.0f}", flush=True)
+
+
+def _ingest(pool, transactions, batch_size):
+    if batch_size == 1:
+        for transaction in transactions:
+            pool.add_transaction(transaction)
+    else:
+        for start in range(0, len(transactions), batch_size):
+            pool.add_transactions(transactions[start:start + batch_size])
+
+
+def run_mempool(args):
+    transactions = [f"{i:08d}: alice pays bob {i % 997} coins" for i in range(args.transactions)]
+    # The input ends by repeating its first tenth, to exercise dedup.
+    transactions += transactions[:args.transactions // 10]
+    print(f"{len(transactions):,} transactions ({args.transactions // 10:,} duplicates), pool bound {args.max_count:,}")
+    print(f"{'batch size':>10} | {'seconds':>8} | {'tx/s':>12} | {'pooled':>9} | {'evicted':>9} | {'duplicates':>10}")
+    print("-" * 74)
+    for batch_size in args.batch_sizes:
+        pool = Mempool(max_count=args.max_count)
+        began = time.perf_counter()
+        _ingest(pool, transactions, batch_size)
+        seconds = time.perf_counter() - began
+        print(f"{batch_size:>10,} | {seconds:>8.3f} | {len(transactions) / seconds:>12,.0f} | {len(pool):>9,} | "
+              f"{pool.evictions:>9,} | {pool.duplicates:>10,}", flush=True)
+
+    blocks = 0
+    pooled = len(pool)
+    began = time.perf_counter()
+    while pool.take(max_bytes=args.block_bytes):
+        blocks += 1
+    seconds = time.perf_counter() - began
+    print(f"\nassembled {blocks:,} blocks of <= {args.block_bytes:,} bytes from {pooled:,} transactions "
+          f"in {seconds:.3f}s ({pooled / seconds:,.0f} tx/s)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Blockchain benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    mining = sub.add_parser("mining", help="proof-of-work hash rate, single process and across a process pool")
+    mining.add_argument("--difficulty", type=int, default=18, help="leading zero bits required")
+    mining.add_argument("--blocks", type=int, default=5)
+    mining.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    mining.add_argument("--hashes", type=int, default=500_000, help="attempts for the single-process comparison")
+    mining.set_defaults(func=run_mining)
+
+    mempool = sub.add_parser("mempool", help="mempool ingestion throughput, per call and in batches")
+    mempool.add_argument("--transactions", type=int, default=500_000)
+    mempool.add_argument("--max-count", type=int, default=200_000, help="pool bound; smaller than the input evicts")
+    mempool.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 100, 10_000])
+    mempool.add_argument("--block-bytes", type=int, default=1_000_000)
+    mempool.set_defaults(func=run_mempool)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
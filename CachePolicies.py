@@ -0,0 +1,331 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from LRU import MISS, LRUCache
+
+
+class EvictionPolicy(ABC):
+    """Base class for bounded caches sharing the LRUCache get/put/clear/hits/misses surface"""
+    name = "base"
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive")
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._reset()
+
+    @abstractmethod
+    def _reset(self) -> None:
+        """Called by __init__ and clear() to set up empty storage"""
+
+    @abstractmethod
+    def get(self, key: int, default=MISS) -> int:
+        ...
+
+    @abstractmethod
+    def put(self, key: int, value: int) -> None:
+        ...
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+    def clear(self) -> None:
+        self._reset()
+        self.hits = 0
+        self.misses = 0
+
+
+class LFUCache(EvictionPolicy):
+    """O(1) LFU: per-frequency recency buckets, evicting the oldest key of the lowest frequency"""
+    name = "lfu"
+
+    def _reset(self) -> None:
+        self._values = {}
+        self._freq = {}
+        self._buckets = {}  # frequency -> OrderedDict of keys, oldest first
+        self._min_freq = 0
+
+    def _touch(self, key) -> None:
+        freq = self._freq[key]
+        bucket = self._buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[freq]
+            if self._min_freq == freq:
+                self._min_freq = freq + 1
+        self._freq[key] = freq + 1
+        self._buckets.setdefault(freq + 1, OrderedDict())[key] = None
+
+    def get(self, key: int, default=MISS) -> int:
+        if key in self._values:
+            self._touch(key)
+            self.hits += 1
+            return self._values[key]
+        self.misses += 1
+        return default
+
+    def put(self, key: int, value: int) -> None:
+        if key in self._values:
+            self._values[key] = value
+            self._touch(key)
+            return
+        if len(self._values) >= self.capacity:
+            bucket = self._buckets[self._min_freq]
+            victim, _ = bucket.popitem(last=False)
+            if not bucket:
+                del self._buckets[self._min_freq]
+            del self._values[victim]
+            del self._freq[victim]
+        self._values[key] = value
+        self._freq[key] = 1
+        self._buckets.setdefault(1, OrderedDict())[key] = None
+        self._min_freq = 1
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+class TwoQueueCache(EvictionPolicy):
+    """Full 2Q: a FIFO for first-time keys, a ghost FIFO of their evictions and an LRU for re-referenced keys"""
+    name = "2q"
+
+    def __init__(self, capacity: int, in_ratio: float = 0.25, out_ratio: float = 0.5):
+        self._in_size = max(1, int(capacity * in_ratio))
+        self._out_size = max(1, int(capacity * out_ratio))
+        super().__init__(capacity)
+
+    def _reset(self) -> None:
+        self._a1in = OrderedDict()
+        self._a1out = OrderedDict()
+        self._am = OrderedDict()
+
+    def get(self, key: int, default=MISS) -> int:
+        if key in self._am:
+            self._am.move_to_end(key)
+            self.hits += 1
+            return self._am[key]
+        if key in self._a1in:
+            # A1in is a FIFO: a hit there must not refresh its position.
+            self.hits += 1
+            return self._a1in[key]
+        self.misses += 1
+        return default
+
+    def _reclaim(self) -> None:
+        if len(self._a1in) + len(self._am) < self.capacity:
+            return
+        if len(self._a1in) > self._in_size or not self._am:
+            victim, _ = self._a1in.popitem(last=False)
+            self._a1out[victim] = None
+            if len(self._a1out) > self._out_size:
+                self._a1out.popitem(last=False)
+        else:
+            self._am.popitem(last=False)
+
+    def put(self, key: int, value: int) -> None:
+        if key in self._am:
+            self._am[key] = value
+            self._am.move_to_end(key)
+        elif key in self._a1in:
+            self._a1in[key] = value
+        elif key in self._a1out:
+            del self._a1out[key]
+            self._reclaim()
+            self._am[key] = value
+        else:
+            self._reclaim()
+            self._a1in[key] = value
+
+    def __len__(self) -> int:
+        return len(self._a1in) + len(self._am)
+
+
+class ARCCache(EvictionPolicy):
+    """Adaptive Replacement Cache balancing recency (T1) against frequency (T2) with ghost lists B1/B2"""
+    name = "arc"
+
+    def _reset(self) -> None:
+        self._t1 = OrderedDict()
+        self._t2 = OrderedDict()
+        self._b1 = OrderedDict()
+        self._b2 = OrderedDict()
+        self._p = 0  # target size of T1
+
+    def get(self, key: int, default=MISS) -> int:
+        if key in self._t1:
+            value = self._t1.pop(key)
+            self._t2[key] = value
+            self.hits += 1
+            return value
+        if key in self._t2:
+            self._t2.move_to_end(key)
+            self.hits += 1
+            return self._t2[key]
+        self.misses += 1
+        return default
+
+    def _replace(self, in_b2: bool) -> None:
+        if len(self._t1) + len(self._t2) < self.capacity:
+            return
+        if self._t1 and (len(self._t1) > self._p or (in_b2 and len(self._t1) == self._p)):
+            victim, _ = self._t1.popitem(last=False)
+            self._b1[victim] = None
+        else:
+            victim, _ = self._t2.popitem(last=False)
+            self._b2[victim] = None
+
+    def put(self, key: int, value: int) -> None:
+        c = self.capacity
+        if key in self._t1:
+            del self._t1[key]
+            self._t2[key] = value
+        elif key in self._t2:
+            self._t2[key] = value
+            self._t2.move_to_end(key)
+        elif key in self._b1:
+            self._p = min(c, self._p + max(len(self._b2) // len(self._b1), 1))
+            self._replace(in_b2=False)
+            del self._b1[key]
+            self._t2[key] = value
+        elif key in self._b2:
+            self._p = max(0, self._p - max(len(self._b1) // len(self._b2), 1))
+            self._replace(in_b2=True)
+            del self._b2[key]
+            self._t2[key] = value
+        else:
+            l1 = len(self._t1) + len(self._b1)
+            if l1 >= c:
+                if len(self._t1) < c:
+                    self._b1.popitem(last=False)
+                    self._replace(in_b2=False)
+                else:
+                    self._t1.popitem(last=False)
+            elif l1 + len(self._t2) + len(self._b2) >= c:
+                if l1 + len(self._t2) + len(self._b2) >= 2 * c:
+                    self._b2.popitem(last=False)
+                self._replace(in_b2=False)
+            self._t1[key] = value
+
+    def __len__(self) -> int:
+        return len(self._t1) + len(self._t2)
+
+
+class _CountMinSketch:
+    """4-bit-saturating count-min sketch with periodic halving, as used by TinyLFU"""
+    _SEEDS = (0x9E3779B1, 0x85EBCA77, 0xC2B2AE3D, 0x27D4EB2F)
+    _HALVE = bytes(c >> 1 for c in range(256))
+
+    def __init__(self, capacity: int):
+        width = 16
+        while width < capacity:
+            width <<= 1
+        self._mask = width - 1
+        self._rows = [bytearray(width) for _ in self._SEEDS]
+        self._sample_size = 10 * capacity
+        self._additions = 0
+
+    def _slots(self, key):
+        h = hash(key)
+        mask = self._mask
+        s0, s1, s2, s3 = self._SEEDS
+        return (((h * s0) >> 16) & mask, ((h * s1) >> 16) & mask,
+                ((h * s2) >> 16) & mask, ((h * s3) >> 16) & mask)
+
+    def increment(self, key) -> None:
+        for row, i in zip(self._rows, self._slots(key)):
+            if row[i] < 15:
+                row[i] += 1
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._age()
+
+    def estimate(self, key) -> int:
+        i0, i1, i2, i3 = self._slots(key)
+        r0, r1, r2, r3 = self._rows
+        return min(r0[i0], r1[i1], r2[i2], r3[i3])
+
+    def _age(self) -> None:
+        self._additions //= 2
+        for row in self._rows:
+            row[:] = row.translate(self._HALVE)
+
+
+class WTinyLFUCache(EvictionPolicy):
+    """W-TinyLFU: a small LRU admission window in front of a segmented LRU guarded by a frequency sketch"""
+    name = "w-tinylfu"
+
+    def __init__(self, capacity: int, window_ratio: float = 0.01, protected_ratio: float = 0.8):
+        self._window_size = max(1, int(capacity * window_ratio))
+        self._main_size = capacity - self._window_size
+        self._protected_size = int(self._main_size * protected_ratio)
+        super().__init__(capacity)
+
+    def _reset(self) -> None:
+        self._window = OrderedDict()
+        self._probation = OrderedDict()
+        self._protected = OrderedDict()
+        self._sketch = _CountMinSketch(self.capacity)
+
+    def _access(self, key):
+        """Refresh a resident key's position; return its segment or None"""
+        if key in self._window:
+            self._window.move_to_end(key)
+            return self._window
+        if key in self._protected:
+            self._protected.move_to_end(key)
+            return self._protected
+        if key in self._probation:
+            self._protected[key] = self._probation.pop(key)
+            if len(self._protected) > self._protected_size:
+                demoted, value = self._protected.popitem(last=False)
+                self._probation[demoted] = value
+                if demoted == key:
+                    return self._probation
+            return self._protected
+        return None
+
+    def get(self, key: int, default=MISS) -> int:
+        segment = self._access(key)
+        if segment is None:
+            # The follow-up put of a read-through miss records the access.
+            self.misses += 1
+            return default
+        self._sketch.increment(key)
+        self.hits += 1
+        return segment[key]
+
+    def put(self, key: int, value: int) -> None:
+        self._sketch.increment(key)
+        segment = self._access(key)
+        if segment is not None:
+            segment[key] = value
+            return
+        self._window[key] = value
+        if len(self._window) <= self._window_size:
+            return
+        candidate, candidate_value = self._window.popitem(last=False)
+        if len(self._probation) + len(self._protected) < self._main_size:
+            self._probation[candidate] = candidate_value
+            return
+        victims = self._probation or self._protected
+        if not victims:
+            return
+        victim = next(iter(victims))
+        if self._sketch.estimate(candidate) > self._sketch.estimate(victim):
+            del victims[victim]
+            self._probation[candidate] = candidate_value
+
+    def __len__(self) -> int:
+        return len(self._window) + len(self._probation) + len(self._protected)
+
+
+POLICIES = {
+    "lru": LRUCache,
+    "lfu": LFUCache,
+    "2q": TwoQueueCache,
+    "arc": ARCCache,
+    "w-tinylfu": WTinyLFUCache,
+}
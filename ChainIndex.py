@@ -0,0 +1,51 @@
+"""Inverted index over block transactions for full-text search.
+
+Each lower-cased word maps to a posting list: an array('q') of the heights
+of blocks containing it. Blocks are indexed in height order, so posting
+lists stay sorted without any sorting. A query for several words
+intersects their lists by walking the shortest one and bisecting into the
+others.
+"""
+import re
+from array import array
+from bisect import bisect_left
+
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text):
+    return _WORD.findall(text.lower())
+
+
+class InvertedIndex:
+    """Word -> sorted block heights; extended with add(height, transactions) in increasing height order"""
+
+    def __init__(self):
+        self.postings = {}
+        self.next_height = 0
+
+    def add(self, height, transactions):
+        if height < self.next_height:
+            raise ValueError(f"Block {height} is already indexed")
+        postings = self.postings
+        for word in set(tokenize(" ".join(map(str, transactions)))):
+            heights = postings.get(word)
+            if heights is None:
+                heights = postings[word] = array('q')
+            heights.append(height)
+        self.next_height = height + 1
+
+    def search(self, query):
+        """Yield, in increasing order, the heights of blocks containing every word of query"""
+        words = set(tokenize(query))
+        if not words:
+            return
+        lists = sorted((self.postings.get(word, ()) for word in words), key=len)
+        shortest, others = lists[0], lists[1:]
+        for height in shortest:
+            for heights in others:
+                i = bisect_left(heights, height)
+                if i == len(heights) or heights[i] != height:
+                    break
+            else:
+                yield height
@@ -0,0 +1,182 @@
+"""External merge sort for integer files larger than memory.
+
+Phase one reads the source in chunks with SortingLoader, gathers chunks into
+runs that fit the memory budget, sorts each run as a whole array and writes
+it to a temporary file as raw little-endian int64s. Phase two k-way merges
+the runs with heapq.merge, refilling each run through its own read buffer.
+When there are more runs than fan_in, runs are merged in groups first, so
+open files and buffers stay bounded.
+"""
+import heapq
+import itertools
+import os
+import sys
+import tempfile
+from array import array
+
+import SortingLoader
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+ITEM_SIZE = array('q').itemsize
+# Rough cost of one integer while a run is gathered and sorted: with NumPy,
+# the chunks plus the concatenated int64 array; without it, the array('q')
+# chunks plus the Python list and int objects sorted() builds.
+BYTES_PER_ITEM = 48 if np is None else 16
+# Raw int64 files, including runs, are little-endian, as SortingLoader reads them.
+_SWAP_BYTES = sys.byteorder != 'little'
+
+
+def _read_int64(f, block_size):
+    block_size -= block_size % ITEM_SIZE
+    while True:
+        block = f.read(block_size)
+        if not block:
+            return
+        values = array('q')
+        values.frombytes(block)
+        if _SWAP_BYTES:
+            values.byteswap()
+        yield from values
+
+
+def _write_run(parts, tmp_dir):
+    if np is not None:
+        # concatenate always copies, so read-only memory-map chunks are never sorted in place.
+        run = np.concatenate(parts).astype(np.int64, copy=False)
+        run.sort()
+    else:
+        run = array('q', sorted(itertools.chain.from_iterable(parts)))
+    fd, path = tempfile.mkstemp(suffix='.run', dir=tmp_dir)
+    with os.fdopen(fd, 'wb') as f:
+        _flush(f, run, "int64")
+    return path
+
+
+def _read_run(path, buffer_size):
+    with open(path, 'rb', buffering=0) as f:
+        yield from _read_int64(f, max(buffer_size, ITEM_SIZE))
+
+
+def _make_runs(chunks, run_items, tmp_dir):
+    """Gather chunks of values into runs of run_items, then sort and write each run"""
+    runs = []
+    parts = []
+    size = 0
+    for chunk in chunks:
+        while len(chunk):
+            part = chunk[:run_items - size]
+            chunk = chunk[len(part):]
+            parts.append(part)
+            size += len(part)
+            if size == run_items:
+                runs.append(_write_run(parts, tmp_dir))
+                parts = []
+                size = 0
+    if size:
+        runs.append(_write_run(parts, tmp_dir))
+    return runs
+
+
+def _merge_runs(paths, buffer_size):
+    return heapq.merge(*(_read_run(path, buffer_size) for path in paths))
+
+
+def _reduce_runs(runs, fan_in, buffer_size, tmp_dir):
+    """Merge runs in groups of fan_in until at most fan_in remain"""
+    while len(runs) > fan_in:
+        merged = []
+        for i in range(0, len(runs), fan_in):
+            group = runs[i:i + fan_in]
+            if len(group) == 1:
+                merged.append(group[0])
+                continue
+            fd, path = tempfile.mkstemp(suffix='.run', dir=tmp_dir)
+            with os.fdopen(fd, 'wb') as out:
+                _write_values(out, _merge_runs(group, buffer_size), "int64", buffer_size)
+            for run in group:
+                os.remove(run)
+            merged.append(path)
+        runs = merged
+    return runs
+
+
+def _write_values(f, values, fmt, buffer_size):
+    count = 0
+    batch = max(1, buffer_size // ITEM_SIZE)
+    buf = array('q') if fmt == "int64" else []
+    for value in values:
+        buf.append(value)
+        if len(buf) >= batch:
+            count += _flush(f, buf, fmt)
+            del buf[:]
+    return count + _flush(f, buf, fmt)
+
+
+def _flush(f, buf, fmt):
+    if len(buf) == 0:
+        return 0
+    if fmt == "int64":
+        if np is not None:
+            np.asarray(buf, dtype="<i8").tofile(f)
+        else:
+            if _SWAP_BYTES:
+                buf = array('q', buf)
+                buf.byteswap()
+            buf.tofile(f)
+    else:
+        f.write("\n".join(map(str, buf)).encode() + b"\n")
+    return len(buf)
+
+
+def external_sort(source, output=None, memory_budget=64 * 2**20, fmt="text", output_fmt=None,
+                  tmp_dir=None, fan_in=64):
+    """Sort the integers in the file at source using at most about memory_budget bytes
+
+    fmt is "text" (comma, space or newline separated) or "int64" (raw
+    little-endian int64s, as SortingLoader reads and writes them); output_fmt
+    defaults to fmt. With an output path the sorted values
+    are written there and their count returned; without one, a generator over
+    the sorted values is returned and the temporary runs live until it is
+    exhausted or closed.
+    """
+    if memory_budget < BYTES_PER_ITEM * 2:
+        raise ValueError("Memory budget too small")
+    if fan_in < 2:
+        raise ValueError("Fan-in must be at least 2")
+    output_fmt = output_fmt or fmt
+    for name in (fmt, output_fmt):
+        if name not in ("text", "int64"):
+            raise ValueError(f"Unknown format {name!r}")
+    # Chunks are read in pieces of at most an eighth of the budget.
+    chunk_bytes = max(ITEM_SIZE, min(1 << 22, memory_budget // 8))
+    if fmt == "text":
+        chunks = SortingLoader.iter_text_chunks(source, block_size=chunk_bytes)
+    else:
+        chunks = SortingLoader.iter_binary_chunks(source, fmt, chunk_items=chunk_bytes // ITEM_SIZE)
+    workdir = tempfile.TemporaryDirectory(dir=tmp_dir, prefix="extsort-")
+    try:
+        runs = _make_runs(chunks, memory_budget // BYTES_PER_ITEM, workdir.name)
+        # During a merge every open run, plus the output, gets an equal share of the budget.
+        buffer_size = memory_budget // (min(len(runs), fan_in) + 1)
+        runs = _reduce_runs(runs, fan_in, buffer_size, workdir.name)
+    except BaseException:
+        workdir.cleanup()
+        raise
+    if output is None:
+        return _stream(runs, buffer_size, workdir)
+    try:
+        with open(output, 'wb') as out:
+            return _write_values(out, _merge_runs(runs, buffer_size), output_fmt, buffer_size)
+    finally:
+        workdir.cleanup()
+
+
+def _stream(runs, buffer_size, workdir):
+    try:
+        yield from _merge_runs(runs, buffer_size)
+    finally:
+        workdir.cleanup()
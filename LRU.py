@@ -1,38 +1,961 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from collections import OrderedDict
-import winsound
+from array import array
+from collections import OrderedDict, deque
+import asyncio
+import functools
+import heapq
+import inspect
+import itertools
+import json
+import mmap
+import os
+import pickle
+import struct
+import threading
+import time
+
+try:
+    import winsound
+except ImportError:  # winsound only exists on Windows
+    winsound = None
+
+class _Miss:
+    """Type of the MISS marker returned by get() when a key is absent"""
+    __slots__ = ()
+
+    def __repr__(self):
+        return "MISS"
+
+    def __bool__(self):
+        return False
+
+MISS = _Miss()
+
+# Operation codes for LRUCache.replay traces
+OP_GET = 0
+OP_PUT = 1
+
+# Snapshot layout: header, then one record per entry from LRU to MRU:
+#   key tag (0 = int64 follows, 1 = u32 length + pickled key)
+#   [float64 seconds left to live, -1 for none]  -- only if header flags has _SNAP_TTL
+#   u32 length + pickled value
+_SNAP_MAGIC = b'LRUSNAP1'
+_SNAP_HEADER = struct.Struct('<8sBQQ')  # magic, flags, entry count, capacity
+_SNAP_TTL = 1
+_U8 = struct.Struct('<B')
+_U32 = struct.Struct('<I')
+_I64 = struct.Struct('<q')
+_F64 = struct.Struct('<d')
+
+class _LazyValue:
+    """A snapshot value still encoded in the memory-mapped file, decoded on first read"""
+    __slots__ = ('_span',)
+
+    def __init__(self, buf, offset: int, length: int):
+        # One attribute, so detach() swaps it atomically under a concurrent reader.
+        self._span = (buf, offset, length)
+
+    def raw(self) -> bytes:
+        try:
+            buf, offset, length = self._span
+            return buf[offset:offset + length]
+        except ValueError:
+            # The checkpoint thread closed the snapshot just after detach() gave this value a copy.
+            buf, offset, length = self._span
+            return buf[offset:offset + length]
+
+    def detach(self) -> None:
+        """Copy the encoded value out of the snapshot, so the mapping can be closed"""
+        data = self.raw()
+        self._span = (data, 0, len(data))
+
+    def decode(self):
+        return pickle.loads(self.raw())
+
+    def __repr__(self):
+        return repr(self.decode())
 
 class LRUCache:
-    """LRU Cache implementation with O(1) operations using OrderedDict"""
-    def __init__(self, capacity: int):
+    """LRU Cache implementation with O(1) operations using OrderedDict
+
+    Entries may carry a TTL (per put, or the cache-wide default), checked lazily on
+    get and swept a few at a time on put. With a weigher, capacity bounds the sum
+    of weigher(value) instead of the entry count. on_evict(key, value) runs for
+    every capacity eviction and on_miss(key) for every miss; enable_stats() adds
+    latency and occupancy tracking.
+    """
+    _SWEEP_BATCH = 8
+
+    def __init__(self, capacity: int, ttl: float = None, weigher=None, clock=time.monotonic,
+                 on_evict=None, on_miss=None):
         if capacity < 0:
             raise ValueError("Capacity must be non-negative")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("TTL must be positive")
         self.capacity = capacity
+        self.ttl = ttl
+        self.weigher = weigher
         self.cache = OrderedDict()
         self.hits = 0
         self.misses = 0
+        self.evictions = 0
+        self.weight = 0
+        self._weights = {}
+        self._deadlines = {}
+        # Min-heap of (deadline, seq, key); seq breaks ties so keys are never
+        # compared. Pairs whose key was since removed or re-put are skipped.
+        self._expiry_heap = []
+        self._expiry_seq = itertools.count()
+        self._clock = clock
+        self._loading = {}
+        self._checkpointer = None
+        # Memory map of the snapshot this cache was loaded from, while values still point into it.
+        self._snapshot = None
+        self._snapshot_path = None
+        self.on_evict = on_evict
+        self.on_miss = on_miss
+        self.stats = None
 
-    def get(self, key: int) -> int:
+    def get(self, key: int, default=MISS) -> int:
         if key in self.cache:
+            if self._deadlines and self._deadlines.get(key, float('inf')) <= self._clock():
+                self._remove(key)
+                self.misses += 1
+                if self.on_miss is not None:
+                    self.on_miss(key)
+                return default
             self.cache.move_to_end(key)
             self.hits += 1
-            return self.cache[key]
+            value = self.cache[key]
+            if type(value) is _LazyValue:
+                value = self.cache[key] = value.decode()
+            return value
         self.misses += 1
-        return -1
+        if self.on_miss is not None:
+            self.on_miss(key)
+        return default
 
-    def put(self, key: int, value: int) -> None:
-        if key in self.cache:
-            self.cache.move_to_end(key)
+    def get_or_load(self, key: int, loader):
+        """Return the cached value for key, computing and storing loader(key) on a miss"""
+        value = self.get(key)
+        if value is MISS:
+            value = loader(key)
+            self.put(key, value)
+        return value
+
+    async def aget_or_load(self, key: int, loader):
+        """Async get_or_load: concurrent misses on one key share a single await loader(key)"""
+        value = self.get(key)
+        if value is not MISS:
+            return value
+        pending = self._loading.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        pending = self._loading[key] = asyncio.get_running_loop().create_future()
+        try:
+            value = await loader(key)
+        except asyncio.CancelledError:
+            pending.cancel()
+            raise
+        except BaseException as exc:
+            pending.set_exception(exc)
+            pending.exception()  # waiters re-raise it; don't log it as unretrieved
+            raise
+        else:
+            self.put(key, value)
+            pending.set_result(value)
+            return value
+        finally:
+            del self._loading[key]
+
+    def put(self, key: int, value: int, ttl: float = None) -> None:
+        if self._expiry_heap:
+            self._sweep(self._SWEEP_BATCH)
+        if self.weigher is None:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+            elif len(self.cache) >= self.capacity and self.capacity > 0:
+                self._evict()
+            self.cache[key] = value
+        else:
+            weight = self.weigher(value)
+            if key in self.cache:
+                self._remove(key)
+            if self.capacity > 0:
+                if weight > self.capacity:
+                    return
+                while self.weight + weight > self.capacity:
+                    self._evict()
+            self.cache[key] = value
+            self._weights[key] = weight
+            self.weight += weight
+        if ttl is None:
+            ttl = self.ttl
+        if ttl is not None:
+            deadline = self._clock() + ttl
+            self._deadlines[key] = deadline
+            heapq.heappush(self._expiry_heap, (deadline, next(self._expiry_seq), key))
+            if len(self._expiry_heap) > 2 * len(self._deadlines) + 64:
+                self._compact_expiry()
+        elif self._deadlines:
+            self._deadlines.pop(key, None)
+
+    def _plain(self) -> bool:
+        """True when no TTL, weigher, hook or stats are in play, so bulk ops may inline get/put"""
+        return (self.weigher is None and self.ttl is None and not self._deadlines
+                and self.stats is None and self.on_evict is None and self.on_miss is None)
+
+    def get_many(self, keys, default=MISS) -> list:
+        """Look up every key in order, returning a list of values (default for misses)"""
+        if not self._plain():
+            return [self.get(key, default) for key in keys]
+        cache = self.cache
+        move = cache.move_to_end
+        values = []
+        append = values.append
+        hits = misses = 0
+        for key in keys:
+            if key in cache:
+                move(key)
+                value = cache[key]
+                if type(value) is _LazyValue:
+                    value = cache[key] = value.decode()
+                append(value)
+                hits += 1
+            else:
+                append(default)
+                misses += 1
+        self.hits += hits
+        self.misses += misses
+        return values
+
+    def put_many(self, items) -> None:
+        """Put every (key, value) pair in order; a mapping is accepted too"""
+        if hasattr(items, 'items'):
+            items = items.items()
+        if not self._plain():
+            for key, value in items:
+                self.put(key, value)
+            return
+        cache = self.cache
+        move = cache.move_to_end
+        popitem = cache.popitem
+        capacity = self.capacity
+        evictions = 0
+        for key, value in items:
+            if key in cache:
+                move(key)
+            elif capacity and len(cache) >= capacity:
+                popitem(last=False)
+                evictions += 1
+            cache[key] = value
+        self.evictions += evictions
+
+    def replay(self, trace) -> dict:
+        """Apply a trace of (op, key, value) rows, op being OP_GET or OP_PUT
+
+        Accepts any iterable of triples or an (n, 3) NumPy array, and returns
+        the gets/puts/hits/misses/evictions it caused. An array is a
+        convenience, not a speedup: its columns are converted to Python ints
+        first, which makes it slower than passing the same trace as a list.
+        """
+        if hasattr(trace, 'tolist'):
+            # Column by column: about half the cost of trace.tolist()'s nested lists.
+            trace = zip(*(trace[:, column].tolist() for column in range(3)))
+        hits = misses = evictions = puts = 0
+        if self._plain():
+            cache = self.cache
+            move = cache.move_to_end
+            popitem = cache.popitem
+            capacity = self.capacity
+            try:
+                for op, key, value in trace:
+                    if op == OP_GET:
+                        if key in cache:
+                            move(key)
+                            hits += 1
+                        else:
+                            misses += 1
+                    elif op == OP_PUT:
+                        puts += 1
+                        if key in cache:
+                            move(key)
+                        elif capacity and len(cache) >= capacity:
+                            popitem(last=False)
+                            evictions += 1
+                        cache[key] = value
+                    else:
+                        raise ValueError(f"Unknown trace op {op!r}")
+            finally:
+                self.hits += hits
+                self.misses += misses
+                self.evictions += evictions
+        else:
+            before = self.hits, self.misses, self.evictions
+            for op, key, value in trace:
+                if op == OP_GET:
+                    self.get(key)
+                elif op == OP_PUT:
+                    puts += 1
+                    self.put(key, value)
+                else:
+                    raise ValueError(f"Unknown trace op {op!r}")
+            hits = self.hits - before[0]
+            misses = self.misses - before[1]
+            evictions = self.evictions - before[2]
+        return {
+            'gets': hits + misses,
+            'puts': puts,
+            'hits': hits,
+            'misses': misses,
+            'evictions': evictions,
+        }
+
+    def save(self, path) -> None:
+        """Write all entries, least recently used first, to a binary snapshot at path
+
+        The file is written beside path and renamed into place, so readers never see
+        a partial snapshot. Values still lazily mapped from a loaded snapshot are
+        copied without decoding. If that snapshot is path itself, its mapping is
+        released before the rename (Windows cannot replace a mapped file).
+        """
+        # Both copies run in C without releasing the GIL, so a checkpoint thread
+        # sees a consistent view without locking out get/put for the slow part.
+        items = list(self.cache.items())
+        deadlines = dict(self._deadlines)
+        now = self._clock()
+        flags = _SNAP_TTL if deadlines else 0
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, 'wb', buffering=1 << 20) as f:
+            f.write(_SNAP_HEADER.pack(_SNAP_MAGIC, flags, len(items), self.capacity))
+            for key, value in items:
+                if type(key) is int and -2**63 <= key < 2**63:
+                    f.write(_U8.pack(0) + _I64.pack(key))
+                else:
+                    data = pickle.dumps(key, pickle.HIGHEST_PROTOCOL)
+                    f.write(_U8.pack(1) + _U32.pack(len(data)) + data)
+                if flags & _SNAP_TTL:
+                    deadline = deadlines.get(key)
+                    f.write(_F64.pack(-1.0 if deadline is None else max(0.0, deadline - now)))
+                data = value.raw() if type(value) is _LazyValue else pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+                f.write(_U32.pack(len(data)))
+                f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        if self._snapshot is not None:
+            try:
+                same = os.path.samefile(path, self._snapshot_path)
+            except OSError:
+                same = False
+            if same:
+                self._release_snapshot()
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path, capacity: int = None, **options):
+        """Build a cache from a snapshot written by save(), keeping its recency order
+
+        The file is memory-mapped and values are only unpickled when first read
+        (or immediately, when a weigher needs them). capacity defaults to the saved
+        one; if it is smaller, the least recently used entries are dropped. The
+        mapping stays open while any value is undecoded; close() releases it.
+        """
+        with open(path, 'rb') as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, flags, count, saved_capacity = _SNAP_HEADER.unpack_from(buf, 0)
+        if magic != _SNAP_MAGIC:
+            buf.close()
+            raise ValueError(f"{path} is not an LRUCache snapshot")
+        cache = cls(saved_capacity if capacity is None else capacity, **options)
+        skip = count - cache.capacity if 0 < cache.capacity < count else 0
+        now = cache._clock()
+        expiring = []
+        lazy = 0
+        pos = _SNAP_HEADER.size
+        for i in range(count):
+            tag, = _U8.unpack_from(buf, pos)
+            pos += 1
+            if tag == 0:
+                key, = _I64.unpack_from(buf, pos)
+                pos += 8
+            else:
+                length, = _U32.unpack_from(buf, pos)
+                key = pickle.loads(buf[pos + 4:pos + 4 + length])
+                pos += 4 + length
+            left = -1.0
+            if flags & _SNAP_TTL:
+                left, = _F64.unpack_from(buf, pos)
+                pos += 8
+            length, = _U32.unpack_from(buf, pos)
+            value = _LazyValue(buf, pos + 4, length)
+            pos += 4 + length
+            if i < skip or left == 0.0:
+                continue
+            if cache.weigher is not None:
+                cache.put(key, value.decode())
+            else:
+                cache.cache[key] = value
+                lazy += 1
+            if left > 0:
+                cache._deadlines[key] = now + left
+                expiring.append((now + left, next(cache._expiry_seq), key))
+        if expiring:
+            heapq.heapify(expiring)
+            cache._expiry_heap = expiring
+        if lazy:
+            cache._snapshot, cache._snapshot_path = buf, path
         else:
-            if len(self.cache) >= self.capacity and self.capacity > 0:
-                self.cache.popitem(last=False)
-        self.cache[key] = value
+            buf.close()
+        return cache
+
+    def _release_snapshot(self) -> None:
+        """Copy undecoded values out of the loaded snapshot and close its memory map"""
+        buf, self._snapshot = self._snapshot, None
+        if buf is None:
+            return
+        for value in list(self.cache.values()):
+            if type(value) is _LazyValue:
+                value.detach()
+        buf.close()
+
+    def close(self) -> None:
+        """Stop checkpointing and release the snapshot this cache was loaded from
+
+        Values not yet read are copied out of the snapshot, so the cache stays
+        usable afterwards.
+        """
+        self.stop_checkpoint()
+        self._release_snapshot()
+
+    def start_checkpoint(self, path, interval: float) -> None:
+        """Save a snapshot to path every interval seconds from a background thread"""
+        if self._checkpointer is not None:
+            raise RuntimeError("Checkpoint already running")
+        stop = threading.Event()
+
+        def run():
+            while not stop.wait(interval):
+                self.save(path)
+
+        thread = threading.Thread(target=run, name="LRUCache checkpoint", daemon=True)
+        thread.start()
+        self._checkpointer = (thread, stop)
+
+    def stop_checkpoint(self) -> None:
+        if self._checkpointer is None:
+            return
+        thread, stop = self._checkpointer
+        self._checkpointer = None
+        stop.set()
+        thread.join()
+
+    def expire(self) -> int:
+        """Drop every expired entry now and return how many were removed"""
+        return self._sweep()
+
+    def _sweep(self, budget: int = None) -> int:
+        now = self._clock()
+        removed = 0
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            if budget is not None:
+                if budget <= 0:
+                    break
+                budget -= 1
+            deadline, _, key = heapq.heappop(heap)
+            if self._deadlines.get(key) == deadline:
+                self._remove(key)
+                removed += 1
+        return removed
+
+    def _compact_expiry(self) -> None:
+        """Keep only the newest heap pair of each key that still has a deadline"""
+        deadlines = self._deadlines
+        latest = {}
+        for item in self._expiry_heap:
+            key = item[2]
+            if deadlines.get(key) == item[0]:
+                kept = latest.get(key)
+                if kept is None or kept[1] < item[1]:
+                    latest[key] = item
+        self._expiry_heap = list(latest.values())
+        heapq.heapify(self._expiry_heap)
+
+    def _evict(self) -> None:
+        key, value = self.cache.popitem(last=False)
+        self.evictions += 1
+        self._forget(key)
+        if self.on_evict is not None:
+            if type(value) is _LazyValue:
+                value = value.decode()
+            self.on_evict(key, value)
+
+    def enable_stats(self, window: int = 1000) -> 'CacheStats':
+        """Start recording per-op latency, insert/update counts and a sliding hit ratio
+
+        Instrumented get/put are installed on this instance only, so a cache
+        without stats keeps the plain methods.
+        """
+        if self.stats is None:
+            self.stats = CacheStats(self, window)
+            self.get, self.put = self.stats._instrument(self.get, self.put)
+        return self.stats
+
+    def disable_stats(self) -> None:
+        self.stats = None
+        self.__dict__.pop('get', None)
+        self.__dict__.pop('put', None)
+
+    def _remove(self, key) -> None:
+        del self.cache[key]
+        self._forget(key)
+
+    def _forget(self, key) -> None:
+        if self.weigher is not None:
+            self.weight -= self._weights.pop(key)
+        if self._deadlines:
+            self._deadlines.pop(key, None)
 
     def clear(self) -> None:
         self.cache.clear()
         self.hits = 0
         self.misses = 0
+        self.evictions = 0
+        self.weight = 0
+        self._weights.clear()
+        self._deadlines.clear()
+        self._expiry_heap.clear()
+        self._release_snapshot()
+        if self.stats is not None:
+            self.stats.reset()
+
+    def __len__(self) -> int:
+        return len(self.cache)
+
+class CacheStats:
+    """Counters, log2 latency histograms and a sliding-window hit ratio for one LRUCache"""
+    BUCKETS = 32  # bucket i counts latencies below 2**i ns; the last one catches the rest
+
+    def __init__(self, cache: LRUCache, window: int = 1000):
+        if window < 1:
+            raise ValueError("Window must be at least 1")
+        self.cache = cache
+        self.window = window
+        self.reset()
+
+    def reset(self) -> None:
+        self.insertions = 0
+        self.updates = 0
+        self.latency = {op: [0] * self.BUCKETS for op in ('get', 'put')}
+        self.latency_sum = {'get': 0, 'put': 0}
+        self._recent = deque(maxlen=self.window)
+        self._recent_hits = 0
+
+    def _instrument(self, get, put):
+        cache = self.cache
+        clock = time.perf_counter_ns
+        last = self.BUCKETS - 1
+        recent = self._recent
+
+        def timed_get(key, default=MISS):
+            hits = cache.hits
+            start = clock()
+            value = get(key, default)
+            elapsed = clock() - start
+            self.latency['get'][min(elapsed.bit_length(), last)] += 1
+            self.latency_sum['get'] += elapsed
+            hit = cache.hits != hits
+            if len(recent) == recent.maxlen:
+                self._recent_hits -= recent[0]
+            recent.append(hit)
+            self._recent_hits += hit
+            return value
+
+        def timed_put(key, value, ttl=None):
+            update = key in cache.cache
+            start = clock()
+            put(key, value, ttl)
+            elapsed = clock() - start
+            self.latency['put'][min(elapsed.bit_length(), last)] += 1
+            self.latency_sum['put'] += elapsed
+            if update:
+                self.updates += 1
+            else:
+                self.insertions += 1
+
+        return timed_get, timed_put
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.cache.hits + self.cache.misses
+        return self.cache.hits / lookups if lookups else 0.0
+
+    @property
+    def window_hit_ratio(self) -> float:
+        return self._recent_hits / len(self._recent) if self._recent else 0.0
+
+    def snapshot(self) -> dict:
+        cache = self.cache
+        return {
+            'hits': cache.hits,
+            'misses': cache.misses,
+            'evictions': cache.evictions,
+            'insertions': self.insertions,
+            'updates': self.updates,
+            'size': len(cache),
+            'capacity': cache.capacity,
+            'weight': cache.weight,
+            'hit_ratio': self.hit_ratio,
+            'window_hit_ratio': self.window_hit_ratio,
+            'latency_ns': {
+                op: {
+                    'count': sum(buckets),
+                    'sum': self.latency_sum[op],
+                    'buckets': {f"<{2 ** i}" if i < self.BUCKETS - 1 else "+Inf": n
+                                for i, n in enumerate(buckets) if n},
+                }
+                for op, buckets in self.latency.items()
+            },
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot())
+
+    def to_prometheus(self, prefix: str = "lru_cache") -> str:
+        """Render the stats in the Prometheus text exposition format"""
+        snap = self.snapshot()
+        lines = []
+        for name, kind, help_text in (
+            ('hits_total', 'counter', 'Lookups that found a live entry'),
+            ('misses_total', 'counter', 'Lookups that found nothing or an expired entry'),
+            ('evictions_total', 'counter', 'Entries evicted to respect capacity'),
+            ('insertions_total', 'counter', 'Puts of a new key'),
+            ('updates_total', 'counter', 'Puts of an existing key'),
+            ('size', 'gauge', 'Entries currently held'),
+            ('capacity', 'gauge', 'Configured capacity, 0 for unbounded'),
+            ('weight', 'gauge', 'Total weight when a weigher is set'),
+            ('window_hit_ratio', 'gauge', f'Hit ratio over the last {self.window} gets'),
+        ):
+            key = name[:-6] if name.endswith('_total') else name
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            lines.append(f"{prefix}_{name} {snap[key]}")
+        metric = f"{prefix}_op_latency_seconds"
+        lines.append(f"# HELP {metric} Latency of get and put calls")
+        lines.append(f"# TYPE {metric} histogram")
+        for op, buckets in self.latency.items():
+            cumulative = 0
+            for i, n in enumerate(buckets[:-1]):
+                cumulative += n
+                lines.append(f'{metric}_bucket{{op="{op}",le="{2 ** i / 1e9:g}"}} {cumulative}')
+            cumulative += buckets[-1]
+            lines.append(f'{metric}_bucket{{op="{op}",le="+Inf"}} {cumulative}')
+            lines.append(f'{metric}_sum{{op="{op}"}} {self.latency_sum[op] / 1e9:g}')
+            lines.append(f'{metric}_count{{op="{op}"}} {cumulative}')
+        return "\n".join(lines) + "\n"
+
+class CompactLRUCache:
+    """Memory-compact LRU Cache for integer keys, keeping recency as index-linked arrays"""
+    # Entries live in parallel array('q') slots; slot 0 is the list sentinel, so
+    # _next[0] is the LRU slot and _prev[0] the MRU slot. Keys are found through an
+    # open-addressed table of slot numbers (0 = empty), which avoids the per-entry
+    # int objects a key -> slot dict would allocate.
+    _FIB = 0x9E3779B97F4A7C15
+    _MASK64 = 0xFFFFFFFFFFFFFFFF
+
+    def __init__(self, capacity: int):
+        if capacity < 0:
+            raise ValueError("Capacity must be non-negative")
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._reset()
+
+    def _reset(self) -> None:
+        self._prev = array('q', [0])
+        self._next = array('q', [0])
+        self._keys = array('q', [0])
+        self._values = [None]
+        self._free = 0  # head of the free-slot chain threaded through _next, 0 = empty
+        self._size = 0
+        self._bits = 3
+        self._table = array('q', bytes(8 << self._bits))
+
+    def _find(self, key: int) -> tuple:
+        """Return (table position, slot) for key; slot is 0 when key is absent"""
+        table, keys = self._table, self._keys
+        mask = len(table) - 1
+        pos = ((key * self._FIB) & self._MASK64) >> (64 - self._bits)
+        while True:
+            slot = table[pos]
+            if not slot or keys[slot] == key:
+                return pos, slot
+            pos = (pos + 1) & mask
+
+    def _table_remove(self, pos: int) -> None:
+        # Backward-shift deletion keeps linear probing free of tombstones.
+        table, keys = self._table, self._keys
+        mask = len(table) - 1
+        shift = 64 - self._bits
+        hole = pos
+        pos = (pos + 1) & mask
+        while table[pos]:
+            home = ((keys[table[pos]] * self._FIB) & self._MASK64) >> shift
+            if (pos - home) & mask >= (pos - hole) & mask:
+                table[hole] = table[pos]
+                hole = pos
+            pos = (pos + 1) & mask
+        table[hole] = 0
+
+    def _grow_table(self) -> None:
+        self._bits += 1
+        self._table = array('q', bytes(8 << self._bits))
+        slot = self._next[0]
+        while slot:
+            pos, _ = self._find(self._keys[slot])
+            self._table[pos] = slot
+            slot = self._next[slot]
+
+    def _unlink(self, slot: int) -> None:
+        prev, nxt = self._prev[slot], self._next[slot]
+        self._next[prev] = nxt
+        self._prev[nxt] = prev
+
+    def _link_mru(self, slot: int) -> None:
+        mru = self._prev[0]
+        self._prev[slot] = mru
+        self._next[slot] = 0
+        self._next[mru] = slot
+        self._prev[0] = slot
+
+    def _allocate(self) -> int:
+        slot = self._free
+        if slot:
+            self._free = self._next[slot]
+            return slot
+        self._prev.append(0)
+        self._next.append(0)
+        self._keys.append(0)
+        self._values.append(None)
+        return len(self._keys) - 1
+
+    def get(self, key: int, default=MISS) -> int:
+        _, slot = self._find(key)
+        if not slot:
+            self.misses += 1
+            return default
+        if self._prev[0] != slot:
+            self._unlink(slot)
+            self._link_mru(slot)
+        self.hits += 1
+        return self._values[slot]
+
+    def put(self, key: int, value: int) -> None:
+        pos, slot = self._find(key)
+        if slot:
+            if self._prev[0] != slot:
+                self._unlink(slot)
+                self._link_mru(slot)
+            self._values[slot] = value
+            return
+        if self._size >= self.capacity and self.capacity > 0:
+            # Recycle the evicted slot in place instead of freeing it.
+            slot = self._next[0]
+            self._unlink(slot)
+            self._table_remove(self._find(self._keys[slot])[0])
+            pos, _ = self._find(key)
+        else:
+            slot = self._allocate()
+            self._size += 1
+            if self._size * 2 > len(self._table):
+                self._grow_table()
+                pos, _ = self._find(key)
+        self._keys[slot] = key
+        self._values[slot] = value
+        self._table[pos] = slot
+        self._link_mru(slot)
+
+    def pop(self, key: int, default=None):
+        pos, slot = self._find(key)
+        if not slot:
+            return default
+        self._table_remove(pos)
+        self._unlink(slot)
+        self._size -= 1
+        value = self._values[slot]
+        self._values[slot] = None
+        self._next[slot] = self._free
+        self._free = slot
+        return value
+
+    def clear(self) -> None:
+        self._reset()
+        self.hits = 0
+        self.misses = 0
+
+    def items(self):
+        """Yield (key, value) pairs from least to most recently used"""
+        slot = self._next[0]
+        while slot:
+            yield self._keys[slot], self._values[slot]
+            slot = self._next[slot]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, key) -> bool:
+        return self._find(key)[1] != 0
+
+class _Flight:
+    """A load in progress that other threads can wait on"""
+    def __init__(self):
+        self._done = threading.Event()
+        self._value = None
+        self._error = None
+
+    def finish(self, value=None, error=None) -> None:
+        self._value = value
+        self._error = error
+        self._done.set()
+
+    def wait(self):
+        self._done.wait()
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+class ShardedLRUCache:
+    """Thread-safe LRU Cache that hashes keys across independently locked LRUCache shards
+
+    Extra keyword options (ttl, weigher, ...) are passed to every shard.
+    """
+    def __init__(self, capacity: int, shards: int = 16, **options):
+        if capacity < 0:
+            raise ValueError("Capacity must be non-negative")
+        if shards < 1:
+            raise ValueError("Shard count must be at least 1")
+        # Never create more bounded shards than there are slots to give them,
+        # otherwise a zero-capacity shard would turn unbounded.
+        if capacity > 0:
+            shards = min(shards, capacity)
+        self.capacity = capacity
+        base, extra = divmod(capacity, shards)
+        self._shards = [LRUCache(base + (1 if i < extra else 0), **options) for i in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self._loading = [{} for _ in range(shards)]
+
+    def _index(self, key) -> int:
+        return hash(key) % len(self._shards)
+
+    def get(self, key: int, default=MISS) -> int:
+        i = self._index(key)
+        with self._locks[i]:
+            return self._shards[i].get(key, default)
+
+    def get_or_load(self, key: int, loader):
+        """Thread-safe get_or_load: concurrent misses on one key share a single loader(key) call"""
+        i = self._index(key)
+        lock, shard, loading = self._locks[i], self._shards[i], self._loading[i]
+        with lock:
+            value = shard.get(key)
+            if value is not MISS:
+                return value
+            flight = loading.get(key)
+            leader = flight is None
+            if leader:
+                flight = loading[key] = _Flight()
+        if not leader:
+            return flight.wait()
+        try:
+            value = loader(key)
+        except BaseException as exc:
+            with lock:
+                del loading[key]
+            flight.finish(error=exc)
+            raise
+        with lock:
+            shard.put(key, value)
+            del loading[key]
+        flight.finish(value)
+        return value
+
+    def put(self, key: int, value: int, ttl: float = None) -> None:
+        i = self._index(key)
+        with self._locks[i]:
+            self._shards[i].put(key, value, ttl)
+
+    def clear(self) -> None:
+        for lock, shard in zip(self._locks, self._shards):
+            with lock:
+                shard.clear()
+
+    def expire(self) -> int:
+        removed = 0
+        for lock, shard in zip(self._locks, self._shards):
+            with lock:
+                removed += shard.expire()
+        return removed
+
+    @property
+    def shard_count(self) -> int:
+        return len(self._shards)
+
+    @property
+    def shard_capacities(self) -> list:
+        return [shard.capacity for shard in self._shards]
+
+    @property
+    def hits(self) -> int:
+        return sum(shard.hits for shard in self._shards)
+
+    @property
+    def misses(self) -> int:
+        return sum(shard.misses for shard in self._shards)
+
+    @property
+    def evictions(self) -> int:
+        return sum(shard.evictions for shard in self._shards)
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+_KWARGS_MARK = object()
+
+def _memo_key(args, kwargs):
+    if not kwargs:
+        return args
+    return args + (_KWARGS_MARK,) + tuple(sorted(kwargs.items()))
+
+def lru_memoize(capacity: int = 128, **options):
+    """Decorator caching a function's results by argument, loading each key only once at a time
+
+    Plain functions share a thread-safe ShardedLRUCache (pass shards=N to stripe it);
+    coroutine functions use an LRUCache with asyncio single-flight loading. Remaining
+    options (ttl, weigher, ...) go to the cache. The cache is exposed as
+    wrapper.cache and emptied with wrapper.cache_clear().
+    """
+    if callable(capacity):
+        return lru_memoize()(capacity)
+
+    def decorate(func):
+        if inspect.iscoroutinefunction(func):
+            cache = LRUCache(capacity, **options)
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                return await cache.aget_or_load(_memo_key(args, kwargs), lambda _: func(*args, **kwargs))
+        else:
+            cache = ShardedLRUCache(capacity, **{'shards': 1, **options})
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                return cache.get_or_load(_memo_key(args, kwargs), lambda _: func(*args, **kwargs))
+
+        wrapper.cache = cache
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorate
 
 class CacheVisualizer(tk.Tk):
     """Modern Tkinter GUI for LRU Cache visualization"""
@@ -44,6 +967,9 @@ class CacheVisualizer(tk.Tk):
         self.cache = None
         self.dark_mode = True
         self.sound_enabled = True
+        self._first_row = 0
+        self._nodes = {}   # key -> [oval id, text id, x, y, label, color] for drawn nodes
+        self._arrows = {}  # slot index on screen -> line id
         self._create_widgets()
         self._setup_styles()
         
@@ -71,9 +997,19 @@ class CacheVisualizer(tk.Tk):
         ttk.Button(control_frame, text="Get", command=self.get_item).grid(row=1, column=5, padx=5)
         ttk.Button(control_frame, text="Clear", command=self.clear_cache).grid(row=1, column=6, padx=5)
         
-        # Visualization Canvas
-        self.canvas = tk.Canvas(self, bg="#1e1e1e", height=500)
-        self.canvas.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+        # Visualization Canvas: nodes wrap row by row and only visible rows are drawn
+        canvas_frame = ttk.Frame(self)
+        canvas_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+        self.canvas = tk.Canvas(canvas_frame, bg="#1e1e1e", height=500)
+        self.scrollbar = ttk.Scrollbar(canvas_frame, orient=tk.VERTICAL, command=self._on_scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.canvas.bind("<Configure>", lambda e: self._visualize_cache())
+        self.canvas.bind("<MouseWheel>", lambda e: self._scroll_rows(-1 if e.delta > 0 else 1))
+        self.canvas.bind("<Button-4>", lambda e: self._scroll_rows(-1))
+        self.canvas.bind("<Button-5>", lambda e: self._scroll_rows(1))
+        self._legend = self.canvas.create_text(20, 30, anchor=tk.W, fill="white",
+                                               font=('Arial', 12, 'bold'))
         
         # Statistics Panel
         stats_frame = ttk.Frame(self)
@@ -150,21 +1086,21 @@ class CacheVisualizer(tk.Tk):
         try:
             key = int(self.key_entry.get())
             value = self.cache.get(key)
-            result = f"GET {key} → {'Found' if value != -1 else 'Not Found'}"
+            result = f"GET {key} → {'Not Found' if value is MISS else 'Found'}"
             self._log_operation(result)
-            self._play_sound(500 if value == -1 else 800)
+            self._play_sound(500 if value is MISS else 800)
             self._update_display()
         except Exception as e:
             messagebox.showerror("Error", str(e))
             
     def clear_cache(self):
-        if self.cache:
+        if self.cache is not None:
             self.cache.clear()
             self._log_operation("Cache cleared")
             self._update_display()
             
     def _validate_inputs(self, need_value=False):
-        if not self.cache:
+        if self.cache is None:
             messagebox.showwarning("Warning", "Initialize cache first")
             return False
             
@@ -193,45 +1129,126 @@ class CacheVisualizer(tk.Tk):
         self._visualize_cache()
         
     def _update_stats(self):
-        if self.cache:
+        if self.cache is not None:
             self.stats_labels['hits'].config(text=f"Hits: {self.cache.hits}")
             self.stats_labels['misses'].config(text=f"Misses: {self.cache.misses}")
-            self.stats_labels['size'].config(text=f"Size: {len(self.cache.cache)}")
+            self.stats_labels['size'].config(text=f"Size: {len(self.cache)}")
             self.stats_labels['capacity'].config(text=f"Capacity: {self.cache.capacity}")
             
-    def _visualize_cache(self):
-        self.canvas.delete("all")
-        if not self.cache or self.cache.capacity == 0:
+    NODE_SIZE = 60
+    NODE_PITCH = 110
+    TOP = 70
+
+    def _grid(self):
+        """Return (nodes per row, rows that fit) for the current canvas size"""
+        width = max(self.canvas.winfo_width(), self.NODE_PITCH)
+        height = max(self.canvas.winfo_height() - self.TOP, self.NODE_PITCH)
+        return max(1, (width - 40 + self.NODE_PITCH - self.NODE_SIZE) // self.NODE_PITCH), \
+            max(1, height // self.NODE_PITCH)
+
+    def _visible_entries(self, start, stop):
+        """Yield (index, key, value) for recency positions [start, stop), walking from the nearer end"""
+        entries = self.cache.cache
+        size = len(entries)
+        stop = min(stop, size)
+        if start >= stop:
             return
-            
-        x = 150
-        y = 250
-        node_size = 60
-        
-        for i, (key, value) in enumerate(self.cache.cache.items()):
+        if start <= size - stop:
+            window = itertools.islice(entries.items(), start, stop)
+        else:
+            window = reversed(list(itertools.islice(reversed(entries.items()), size - stop, size - start)))
+        for i, (key, value) in zip(itertools.count(start), window):
+            yield i, key, value
+
+    def _visualize_cache(self):
+        size = len(self.cache) if self.cache is not None and self.cache.capacity else 0
+        per_row, rows = self._grid()
+        total_rows = -(-size // per_row)
+        self._first_row = max(0, min(self._first_row, total_rows - rows))
+        start = self._first_row * per_row
+        stop = start + rows * per_row
+
+        drawn = self._nodes
+        self._nodes = {}
+        for i, key, value in self._visible_entries(start, stop):
+            row, col = divmod(i - start, per_row)
+            x = 20 + col * self.NODE_PITCH
+            y = self.TOP + row * self.NODE_PITCH
+            label = f"{key}:{value}"
             color = "#4CAF50" if i == 0 else "#2196F3"
-            self._draw_node(x, y, key, value, color)
-            if i > 0:
-                self._draw_arrow(x-node_size-20, y, x-node_size, y)
-            x += node_size + 50
-            
-        self._draw_legend()
-            
-    def _draw_node(self, x, y, key, value, color):
-        self.canvas.create_oval(x, y, x+60, y+60, fill=color, outline="white")
-        self.canvas.create_text(x+30, y+30, text=f"{key}:{value}", 
-                              fill="white", font=('Arial', 10, 'bold'))
-        
+            node = drawn.pop(key, None)
+            if node is None:
+                node = self._draw_node(x, y, label, color)
+            else:
+                self._update_node(node, x, y, label, color)
+            self._nodes[key] = node
+        for oval, text, *_ in drawn.values():
+            self.canvas.delete(oval, text)
+
+        visible = min(stop, size) - start
+        links = {slot for slot in range(1, visible) if slot % per_row}
+        for slot in list(self._arrows):
+            if slot not in links:
+                self.canvas.delete(self._arrows.pop(slot))
+        for slot in links:
+            row, col = divmod(slot, per_row)
+            x = 20 + col * self.NODE_PITCH
+            y = self.TOP + row * self.NODE_PITCH
+            coords = (x - self.NODE_PITCH + self.NODE_SIZE, y + self.NODE_SIZE / 2, x, y + self.NODE_SIZE / 2)
+            if slot in self._arrows:
+                self.canvas.coords(self._arrows[slot], *coords)
+            else:
+                self._arrows[slot] = self._draw_arrow(*coords)
+
+        self._draw_legend(start, start + visible, size)
+        if total_rows > rows:
+            self.scrollbar.set(self._first_row / total_rows, (self._first_row + rows) / total_rows)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _draw_node(self, x, y, label, color):
+        oval = self.canvas.create_oval(x, y, x+self.NODE_SIZE, y+self.NODE_SIZE, fill=color, outline="white")
+        text = self.canvas.create_text(x+self.NODE_SIZE/2, y+self.NODE_SIZE/2, text=label,
+                                       fill="white", font=('Arial', 10, 'bold'))
+        return [oval, text, x, y, label, color]
+
+    def _update_node(self, node, x, y, label, color):
+        oval, text, old_x, old_y, old_label, old_color = node
+        if (x, y) != (old_x, old_y):
+            self.canvas.move(oval, x - old_x, y - old_y)
+            self.canvas.move(text, x - old_x, y - old_y)
+            node[2], node[3] = x, y
+        if label != old_label:
+            self.canvas.itemconfig(text, text=label)
+            node[4] = label
+        if color != old_color:
+            self.canvas.itemconfig(oval, fill=color)
+            node[5] = color
+
     def _draw_arrow(self, x1, y1, x2, y2):
-        self.canvas.create_line(x1+30, y1+30, x2, y2+30, 
-                              arrow=tk.LAST, fill="white", width=2)
-        
-    def _draw_legend(self):
-        self.canvas.create_text(100, 100, text="LRU", fill="white", 
-                              font=('Arial', 12, 'bold'))
-        self.canvas.create_text(1100, 100, text="MRU", fill="white", 
-                              font=('Arial', 12, 'bold'))
-        
+        return self.canvas.create_line(x1, y1, x2, y2, arrow=tk.LAST, fill="white", width=2)
+
+    def _draw_legend(self, first, last, size):
+        text = f"LRU → MRU, row by row    entries {first + 1}–{last} of {size}" if size else "LRU → MRU"
+        self.canvas.itemconfig(self._legend, text=text)
+
+    def _scroll_rows(self, delta):
+        self._first_row = max(0, self._first_row + delta)
+        self._visualize_cache()
+
+    def _on_scroll(self, action, amount, unit=None):
+        per_row, rows = self._grid()
+        size = len(self.cache) if self.cache is not None else 0
+        total_rows = -(-size // per_row)
+        if action == tk.MOVETO:
+            self._first_row = int(float(amount) * total_rows)
+        elif unit == tk.PAGES:
+            self._first_row += int(amount) * rows
+        else:
+            self._first_row += int(amount)
+        self._first_row = max(0, self._first_row)
+        self._visualize_cache()
+
     def _log_operation(self, message):
         self.log.insert(tk.END, f"[{self._timestamp()}] {message}\n")
         self.log.see(tk.END)
@@ -250,7 +1267,7 @@ class CacheVisualizer(tk.Tk):
         self._setup_styles()
         
     def _play_sound(self, freq):
-        if self.sound_enabled:
+        if self.sound_enabled and winsound is not None:
             winsound.Beep(freq, 200)
 
 if __name__ == "__main__":
@@ -0,0 +1,277 @@
+import argparse
+import itertools
+import random
+import threading
+import time
+import tracemalloc
+
+from CachePolicies import POLICIES
+from LRU import MISS, OP_GET, OP_PUT, CompactLRUCache, LRUCache, ShardedLRUCache
+
+ENGINES = {
+    "ordereddict": LRUCache,
+    "compact": CompactLRUCache,
+}
+
+
+def _random_keys(count, key_space, seed):
+    rng = random.Random(seed)
+    return [rng.randrange(key_space) for _ in range(count)]
+
+
+def bench_threads(cache, threads: int, ops_per_thread: int, key_space: int, read_ratio: float = 0.8) -> float:
+    """Hammer cache with get/put from several threads and return ops/sec"""
+    workloads = []
+    for t in range(threads):
+        rng = random.Random(t)
+        keys = _random_keys(ops_per_thread, key_space, seed=t)
+        reads = [rng.random() < read_ratio for _ in range(ops_per_thread)]
+        workloads.append((keys, reads))
+
+    start = threading.Barrier(threads + 1)
+
+    def worker(keys, reads):
+        get, put = cache.get, cache.put
+        start.wait()
+        for key, read in zip(keys, reads):
+            if read:
+                get(key)
+            else:
+                put(key, key)
+
+    pool = [threading.Thread(target=worker, args=w) for w in workloads]
+    for thread in pool:
+        thread.start()
+    start.wait()
+    began = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - began
+    return threads * ops_per_thread / elapsed
+
+
+def run_sharded(args):
+    print(f"{'threads':>7} | {'global lock':>14} | {f'{args.shards} shards':>14} | {'speedup':>7}")
+    print("-" * 52)
+    for threads in args.threads:
+        baseline = ShardedLRUCache(args.capacity, shards=1)
+        sharded = ShardedLRUCache(args.capacity, shards=args.shards)
+        base_ops = bench_threads(baseline, threads, args.ops, args.key_space)
+        shard_ops = bench_threads(sharded, threads, args.ops, args.key_space)
+        print(f"{threads:>7} | {base_ops:>10,.0f} op/s | {shard_ops:>10,.0f} op/s | {shard_ops / base_ops:>6.2f}x")
+
+
+def measure_memory(factory, entries: int) -> int:
+    """Return the bytes traced while filling a fresh cache with `entries` integer keys"""
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        cache = factory(entries)
+        put = cache.put
+        for key in range(entries):
+            put(key, key)
+        used = tracemalloc.get_traced_memory()[0] - baseline
+    finally:
+        tracemalloc.stop()
+    del cache
+    return used
+
+
+def bench_get_put(factory, capacity: int, ops: int, key_space: int) -> tuple:
+    """Return (put ops/sec, get ops/sec) for a single-threaded mixed-hit workload"""
+    keys = _random_keys(ops, key_space, seed=0)
+    cache = factory(capacity)
+    put, get = cache.put, cache.get
+    began = time.perf_counter()
+    for key in keys:
+        put(key, key)
+    put_rate = ops / (time.perf_counter() - began)
+    began = time.perf_counter()
+    for key in keys:
+        get(key)
+    get_rate = ops / (time.perf_counter() - began)
+    return put_rate, get_rate
+
+
+def run_memory(args):
+    print(f"{'engine':<12} | {'entries':>9} | {'traced':>10} | {'bytes/entry':>11}")
+    print("-" * 52)
+    for name in args.engines:
+        used = measure_memory(ENGINES[name], args.entries)
+        print(f"{name:<12} | {args.entries:>9,} | {used / 2**20:>7.1f} MB | {used / args.entries:>11.1f}")
+
+
+def run_engines(args):
+    print(f"{'engine':<12} | {'put':>14} | {'get':>14}")
+    print("-" * 46)
+    for name in args.engines:
+        put_rate, get_rate = bench_get_put(ENGINES[name], args.capacity, args.ops, args.key_space)
+        print(f"{name:<12} | {put_rate:>10,.0f} op/s | {get_rate:>10,.0f} op/s")
+
+
+def zipf_trace(length: int, key_space: int, alpha: float = 1.0, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    weights = list(itertools.accumulate(1.0 / (rank ** alpha) for rank in range(1, key_space + 1)))
+    keys = list(range(key_space))
+    rng.shuffle(keys)
+    return rng.choices(keys, cum_weights=weights, k=length)
+
+
+def scan_trace(length: int, key_space: int, scan_length: int, seed: int = 0) -> list:
+    """Zipf traffic interleaved with one-off sequential scans over keys outside the hot set"""
+    hot = zipf_trace(length, key_space, seed=seed)
+    trace = []
+    next_scan_key = key_space
+    for start in range(0, length, scan_length):
+        trace.extend(hot[start:start + scan_length])
+        trace.extend(range(next_scan_key, next_scan_key + scan_length // 2))
+        next_scan_key += scan_length // 2
+    return trace
+
+
+def load_trace(path: str) -> list:
+    """Read one integer key per line"""
+    with open(path) as f:
+        return [int(line) for line in f if line.strip()]
+
+
+def replay_keys(cache, trace) -> float:
+    """Read-through replay: get every key and put it on a miss. Return ops/sec"""
+    get, put = cache.get, cache.put
+    began = time.perf_counter()
+    for key in trace:
+        if get(key) is MISS:
+            put(key, key)
+    return len(trace) / (time.perf_counter() - began)
+
+
+def run_policies(args):
+    if args.trace_file:
+        trace = load_trace(args.trace_file)
+    elif args.trace == "scan":
+        trace = scan_trace(args.length, args.key_space, args.scan_length, seed=args.seed)
+    else:
+        trace = zipf_trace(args.length, args.key_space, alpha=args.alpha, seed=args.seed)
+    print(f"{len(trace):,} accesses, capacity {args.capacity:,}")
+    print(f"{'policy':<10} | {'hit ratio':>9} | {'throughput':>15}")
+    print("-" * 41)
+    for name in args.policies:
+        cache = POLICIES[name](args.capacity)
+        rate = replay_keys(cache, trace)
+        ratio = cache.hits / max(1, cache.hits + cache.misses)
+        print(f"{name:<10} | {ratio:>9.2%} | {rate:>10,.0f} op/s")
+
+
+def op_trace(length: int, key_space: int, read_ratio: float = 0.8, seed: int = 0) -> list:
+    """(op, key, value) rows over zipf-distributed keys"""
+    rng = random.Random(seed)
+    keys = zipf_trace(length, key_space, seed=seed)
+    return [(OP_GET if rng.random() < read_ratio else OP_PUT, key, key) for key in keys]
+
+
+def _timed(fn):
+    began = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - began
+
+
+def run_replay(args):
+    trace = op_trace(args.length, args.key_space, args.read_ratio, seed=args.seed)
+    keys = [key for _, key, _ in trace]
+    items = [(key, value) for _, key, value in trace]
+
+    def per_call():
+        cache = LRUCache(args.capacity)
+        get, put = cache.get, cache.put
+        for op, key, value in trace:
+            if op == OP_GET:
+                get(key)
+            else:
+                put(key, value)
+        return cache.hits, cache.misses, cache.evictions
+
+    def batched():
+        cache = LRUCache(args.capacity)
+        stats = cache.replay(trace)
+        return stats['hits'], stats['misses'], stats['evictions']
+
+    rows = []
+    loop_stats, loop_time = _timed(per_call)
+    replay_stats, replay_time = _timed(batched)
+    assert loop_stats == replay_stats, (loop_stats, replay_stats)
+    rows.append(("replay", loop_time, replay_time))
+
+    warm = LRUCache(args.capacity)
+    warm.put_many(items)
+    _, loop_time = _timed(lambda: [warm.get(key) for key in keys])
+    _, bulk_time = _timed(lambda: warm.get_many(keys))
+    rows.append(("get_many", loop_time, bulk_time))
+
+    def put_loop():
+        cache = LRUCache(args.capacity)
+        for key, value in items:
+            cache.put(key, value)
+    _, loop_time = _timed(put_loop)
+    _, bulk_time = _timed(lambda: LRUCache(args.capacity).put_many(items))
+    rows.append(("put_many", loop_time, bulk_time))
+
+    print(f"{len(trace):,} ops, capacity {args.capacity:,}, "
+          f"hits {replay_stats[0]:,}, misses {replay_stats[1]:,}, evictions {replay_stats[2]:,}")
+    print(f"{'operation':<15} | {'per-call':>15} | {'batched':>15} | {'speedup':>7}")
+    print("-" * 62)
+    for name, loop_time, bulk_time in rows:
+        n = len(trace)
+        print(f"{name:<15} | {n / loop_time:>10,.0f} op/s | {n / bulk_time:>10,.0f} op/s | "
+              f"{loop_time / bulk_time:>6.2f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="LRU cache benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sharded = sub.add_parser("sharded", help="multi-threaded throughput: sharded vs global lock")
+    sharded.add_argument("--capacity", type=int, default=10_000)
+    sharded.add_argument("--shards", type=int, default=16)
+    sharded.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    sharded.add_argument("--ops", type=int, default=100_000, help="operations per thread")
+    sharded.add_argument("--key-space", type=int, default=20_000)
+    sharded.set_defaults(func=run_sharded)
+
+    memory = sub.add_parser("memory", help="tracemalloc footprint of each cache engine")
+    memory.add_argument("--entries", type=int, default=1_000_000)
+    memory.add_argument("--engines", nargs="+", choices=sorted(ENGINES), default=list(ENGINES))
+    memory.set_defaults(func=run_memory)
+
+    engines = sub.add_parser("engines", help="single-threaded get/put throughput of each cache engine")
+    engines.add_argument("--capacity", type=int, default=100_000)
+    engines.add_argument("--ops", type=int, default=1_000_000)
+    engines.add_argument("--key-space", type=int, default=200_000)
+    engines.add_argument("--engines", nargs="+", choices=sorted(ENGINES), default=list(ENGINES))
+    engines.set_defaults(func=run_engines)
+
+    policies = sub.add_parser("policies", help="replay one key trace through every eviction policy")
+    policies.add_argument("--capacity", type=int, default=1_000)
+    policies.add_argument("--trace", choices=["zipf", "scan"], default="scan")
+    policies.add_argument("--trace-file", help="file with one integer key per line (overrides --trace)")
+    policies.add_argument("--length", type=int, default=500_000)
+    policies.add_argument("--key-space", type=int, default=50_000)
+    policies.add_argument("--alpha", type=float, default=1.0)
+    policies.add_argument("--scan-length", type=int, default=5_000)
+    policies.add_argument("--seed", type=int, default=0)
+    policies.add_argument("--policies", nargs="+", choices=list(POLICIES), default=list(POLICIES))
+    policies.set_defaults(func=run_policies)
+
+    replay = sub.add_parser("replay", help="batched replay/get_many/put_many vs per-call loops")
+    replay.add_argument("--capacity", type=int, default=10_000)
+    replay.add_argument("--length", type=int, default=1_000_000)
+    replay.add_argument("--key-space", type=int, default=100_000)
+    replay.add_argument("--read-ratio", type=float, default=0.8)
+    replay.add_argument("--seed", type=int, default=0)
+    replay.set_defaults(func=run_replay)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
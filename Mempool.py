@@ -0,0 +1,175 @@
+"""Bounded, indexed pool of pending transactions.
+
+Transactions are keyed by their Merkle leaf hash, so duplicates are found
+in O(1). Each has a priority (higher is mined first, ties in arrival order).
+Two heaps order the pool: one by priority for block assembly and one by
+reverse priority for eviction when the pool exceeds max_count or max_bytes.
+Among equal priorities the newest is evicted first, so a full pool turns
+away new arrivals rather than churning out transactions already queued.
+Both heaps are cleaned lazily: entries for transactions that have since left
+the pool are skipped when popped, and the heaps are rebuilt once stale
+entries outnumber live ones.
+"""
+import heapq
+
+from MerkleTree import leaf_hash
+
+# Block assembly gives up after passing over this many transactions too large for the space left.
+MAX_SKIPPED = 1000
+
+
+def _size(transaction):
+    return len(transaction) if isinstance(transaction, bytes) else len(str(transaction).encode())
+
+
+class Mempool:
+    """Pending transactions, bounded by count and total encoded bytes"""
+
+    def __init__(self, max_count=100_000, max_bytes=64 * 2**20, max_transaction_bytes=None):
+        if max_count <= 0 or max_bytes <= 0 or (max_transaction_bytes is not None and max_transaction_bytes <= 0):
+            raise ValueError("Mempool bounds must be positive")
+        self.max_count = max_count
+        self.max_bytes = max_bytes
+        # Larger transactions are refused outright, e.g. ones that could never fit in a block.
+        self.max_transaction_bytes = max_bytes if max_transaction_bytes is None else min(max_transaction_bytes,
+                                                                                          max_bytes)
+        self.evictions = 0
+        self.duplicates = 0
+        self.rejected = 0
+        self.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, transaction):
+        return leaf_hash(transaction) in self.entries
+
+    def __iter__(self):
+        """Transactions in mining order"""
+        return iter(self.head(len(self._by_priority)))
+
+    def head(self, limit):
+        """The first limit transactions in mining order, without sorting the whole pool"""
+        entries = self.entries
+        live = (item for item in self._by_priority if item[2] in entries and entries[item[2]][1] == item[1])
+        return [entries[item[2]][2] for item in heapq.nsmallest(limit, live)]
+
+    def get(self, txid):
+        entry = self.entries.get(txid)
+        return None if entry is None else entry[2]
+
+    def add_transaction(self, transaction, priority=0):
+        """Add one transaction; False if it is a duplicate, too large, or was evicted to make room"""
+        return self.add_transactions((transaction,), priority) == 1
+
+    def add_transactions(self, batch, priority=0):
+        """Add many transactions with one priority; return how many are in the pool afterwards
+
+        Duplicates within the batch or of pooled transactions are skipped.
+        Large batches are heapified in one pass instead of pushed one by one.
+        """
+        entries = self.entries
+        seq = self._seq
+        added = []
+        for transaction in batch:
+            txid = leaf_hash(transaction)
+            if txid in entries:
+                self.duplicates += 1
+                continue
+            size = _size(transaction)
+            if size > self.max_transaction_bytes:
+                self.rejected += 1
+                continue
+            entries[txid] = (priority, seq, transaction, size)
+            self.bytes += size
+            added.append((seq, txid))
+            seq += 1
+        self._seq = seq
+        if len(added) > len(self._by_priority) // 8:
+            self._by_priority.extend((-priority, s, txid) for s, txid in added)
+            self._by_eviction.extend((priority, -s, txid) for s, txid in added)
+            heapq.heapify(self._by_priority)
+            heapq.heapify(self._by_eviction)
+        else:
+            for s, txid in added:
+                heapq.heappush(self._by_priority, (-priority, s, txid))
+                heapq.heappush(self._by_eviction, (priority, -s, txid))
+        self._enforce_bounds()
+        return sum(txid in entries for _, txid in added)
+
+    def _enforce_bounds(self):
+        heap = self._by_eviction
+        entries = self.entries
+        while len(entries) > self.max_count or self.bytes > self.max_bytes:
+            _, neg_seq, txid = heapq.heappop(heap)
+            entry = entries.get(txid)
+            if entry is None or entry[1] != -neg_seq:
+                continue
+            self._discard(txid)
+            self.evictions += 1
+        self._compact()
+
+    def _discard(self, txid):
+        entry = self.entries.pop(txid)
+        self.bytes -= entry[3]
+        return entry
+
+    def _compact(self):
+        entries = self.entries
+        limit = 2 * len(entries) + 64
+        if len(self._by_priority) > limit:
+            self._by_priority = [item for item in self._by_priority
+                                 if item[2] in entries and entries[item[2]][1] == item[1]]
+            heapq.heapify(self._by_priority)
+        if len(self._by_eviction) > limit:
+            self._by_eviction = [item for item in self._by_eviction
+                                 if item[2] in entries and entries[item[2]][1] == -item[1]]
+            heapq.heapify(self._by_eviction)
+
+    def take(self, max_count=None, max_bytes=None):
+        """Remove and return the highest-priority transactions that fit in a block
+
+        Transactions too large for the bytes left are skipped, so smaller
+        ones behind them can still fill the block; they stay in the pool.
+        """
+        heap = self._by_priority
+        entries = self.entries
+        taken = []
+        skipped = []
+        room = max_bytes
+        while heap and (max_count is None or len(taken) < max_count):
+            item = heapq.heappop(heap)
+            entry = entries.get(item[2])
+            if entry is None or entry[1] != item[1]:
+                continue
+            if room is not None and entry[3] > room:
+                skipped.append(item)
+                if room == 0 or len(skipped) >= MAX_SKIPPED:
+                    break
+                continue
+            self._discard(item[2])
+            taken.append(entry[2])
+            if room is not None:
+                room -= entry[3]
+        for item in skipped:
+            heapq.heappush(heap, item)
+        self._compact()
+        return taken
+
+    def remove(self, transactions):
+        """Drop transactions (e.g. ones included in a block from elsewhere); return how many were pooled"""
+        removed = 0
+        for transaction in transactions:
+            txid = leaf_hash(transaction)
+            if txid in self.entries:
+                self._discard(txid)
+                removed += 1
+        self._compact()
+        return removed
+
+    def clear(self):
+        self.entries = {}  # txid -> (priority, seq, transaction, size)
+        self._by_priority = []  # (-priority, seq, txid): next to mine on top
+        self._by_eviction = []  # (priority, -seq, txid): next to evict on top
+        self._seq = 0
+        self.bytes = 0
@@ -0,0 +1,105 @@
+"""Merkle trees over block transactions.
+
+Leaves and interior nodes are hashed with different one-byte prefixes
+(as in RFC 6962), so a leaf can never be passed off as an interior node. A
+node without a sibling is promoted to the next level unchanged instead of
+being paired with a copy of itself, which keeps distinct transaction lists
+from sharing a root.
+
+A proof is a list of (sibling digest, sibling_is_left) pairs from the leaf
+up to the root: O(log n) digests for n transactions.
+"""
+import hashlib
+
+LEAF_PREFIX = b'\x00'
+NODE_PREFIX = b'\x01'
+EMPTY_ROOT = hashlib.sha256(b'').hexdigest()
+
+
+def _encode(transaction):
+    return transaction if isinstance(transaction, bytes) else str(transaction).encode()
+
+
+def leaf_hash(transaction):
+    return hashlib.sha256(LEAF_PREFIX + _encode(transaction)).digest()
+
+
+def node_hash(left, right):
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+def _parents(level, start):
+    """Hash level[start:] pairwise; start must be even"""
+    sha256 = hashlib.sha256
+    parents = [sha256(NODE_PREFIX + level[i] + level[i + 1]).digest() for i in range(start, len(level) - 1, 2)]
+    if len(level) & 1:
+        parents.append(level[-1])
+    return parents
+
+
+class MerkleTree:
+    """Merkle tree that can be extended with more transactions in batches
+
+    Every level is kept, so proofs are read off in O(log n). Extending the
+    tree only rehashes the right edge touched by the new leaves.
+    """
+
+    def __init__(self, transactions=()):
+        self.levels = [[]]
+        self.extend(transactions)
+
+    def __len__(self):
+        return len(self.levels[0])
+
+    def append(self, transaction):
+        self.extend((transaction,))
+
+    def extend(self, transactions):
+        sha256 = hashlib.sha256
+        leaves = self.levels[0]
+        first = len(leaves)
+        leaves.extend([sha256(LEAF_PREFIX + _encode(tx)).digest() for tx in transactions])
+        if len(leaves) == first:
+            return
+        depth = 0
+        while len(self.levels[depth]) > 1:
+            # Everything left of the first changed pair is unaffected.
+            first &= ~1
+            parents = _parents(self.levels[depth], first)
+            first //= 2
+            if depth + 1 == len(self.levels):
+                self.levels.append([])
+            del self.levels[depth + 1][first:]
+            self.levels[depth + 1].extend(parents)
+            depth += 1
+        del self.levels[depth + 1:]
+
+    @property
+    def root(self):
+        """Hex digest of the root; EMPTY_ROOT for a tree with no transactions"""
+        top = self.levels[-1]
+        return top[0].hex() if top else EMPTY_ROOT
+
+    def proof(self, index):
+        """Sibling path for the transaction at index"""
+        if not 0 <= index < len(self):
+            raise IndexError("transaction index out of range")
+        path = []
+        for level in self.levels[:-1]:
+            sibling = index ^ 1
+            if sibling < len(level):
+                path.append((level[sibling], sibling < index))
+            index //= 2
+        return path
+
+
+def merkle_root(transactions):
+    return MerkleTree(transactions).root
+
+
+def verify_proof(transaction, proof, root):
+    """Check that transaction is a leaf of the tree with the given hex root"""
+    digest = leaf_hash(transaction)
+    for sibling, sibling_is_left in proof:
+        digest = node_hash(sibling, digest) if sibling_is_left else node_hash(digest, sibling)
+    return digest.hex() == root
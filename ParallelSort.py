@@ -0,0 +1,86 @@
+"""Multi-process sorting for large integer inputs.
+
+The input is copied once into a shared-memory block of int64s. Pool workers
+attach to it by name and each sorts its own chunk in place, so no chunk is
+pickled in either direction. The parent then k-way merges the sorted chunks
+with heapq.merge.
+"""
+import heapq
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import SortingEngine
+
+ITEM_SIZE = array('q').itemsize
+
+
+def _sort_chunk(name, start, stop, algorithm):
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        view = shm.buf.cast('q')
+        try:
+            chunk = view[start:stop].tolist()
+            if algorithm is None:
+                chunk.sort()
+            else:
+                SortingEngine.sort(SortingEngine.ALGORITHMS[algorithm], chunk)
+            view[start:stop] = array('q', chunk)
+        finally:
+            view.release()
+    finally:
+        shm.close()
+
+
+def chunk_bounds(n, workers, chunk_size=None):
+    """Split range(n) into (start, stop) chunks; by default one per worker"""
+    if chunk_size is None:
+        chunk_size = max(1, -(-n // workers))
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be positive")
+    return [(start, min(start + chunk_size, n)) for start in range(0, n, chunk_size)]
+
+
+def parallel_sort(data, workers=None, chunk_size=None, algorithm=None, executor=None):
+    """Return the integers in data sorted, sorting chunks in a process pool
+
+    workers defaults to os.cpu_count() and chunk_size to an even split across
+    them. algorithm names a SortingEngine.ALGORITHMS entry to run inside the
+    workers; by default they use list.sort. Pass an existing ProcessPoolExecutor
+    to reuse its processes across calls.
+    """
+    values = array('q', data)
+    n = len(values)
+    if n < 2:
+        return values.tolist()
+    workers = workers or os.cpu_count() or 1
+    chunks = chunk_bounds(n, workers, chunk_size)
+
+    shm = shared_memory.SharedMemory(create=True, size=n * ITEM_SIZE)
+    try:
+        view = shm.buf.cast('q')
+        try:
+            view[:] = values
+            del values
+            pool = executor or ProcessPoolExecutor(max_workers=workers)
+            try:
+                futures = [pool.submit(_sort_chunk, shm.name, start, stop, algorithm) for start, stop in chunks]
+                for future in futures:
+                    future.result()
+            finally:
+                if executor is None:
+                    pool.shutdown()
+            if len(chunks) == 1:
+                return view.tolist()
+            runs = [view[start:stop] for start, stop in chunks]
+            try:
+                return list(heapq.merge(*runs))
+            finally:
+                for run in runs:
+                    run.release()
+        finally:
+            view.release()
+    finally:
+        shm.close()
+        shm.unlink()
@@ -0,0 +1,126 @@
+"""Proof-of-work nonce search.
+
+A mined block's hash is sha256(prefix + str(nonce)), where the prefix holds
+every other header field. The prefix is hashed once and each attempt resumes
+from a copy of that state, so only the nonce digits are hashed per attempt.
+Difficulty is the number of leading zero bits the hash must have.
+
+Miner partitions the nonce space across a process pool: worker k of w tries
+k, k + w, k + 2w, ... The first worker to succeed sets a shared event, and
+the others stop within CHECK_EVERY attempts.
+"""
+import hashlib
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+CHECK_EVERY = 4096
+MAX_DIFFICULTY = 255
+
+_cancel = None
+
+
+def target(difficulty):
+    """Hashes (as 32 big-endian bytes) below this value meet difficulty"""
+    if not 0 <= difficulty <= MAX_DIFFICULTY:
+        raise ValueError(f"Difficulty must be between 0 and {MAX_DIFFICULTY}")
+    if difficulty == 0:
+        return b'\xff' * 33  # longer than any digest, so above all of them
+    return (1 << (256 - difficulty)).to_bytes(32, 'big')
+
+
+def meets_difficulty(block_hash, difficulty):
+    return bytes.fromhex(block_hash) < target(difficulty)
+
+
+def search(prefix, difficulty, start=0, step=1, limit=None):
+    """Try nonces start, start + step, ...; return (nonce or None, attempts)
+
+    Gives up after limit attempts, or when another worker has set the
+    cancel event.
+    """
+    goal = target(difficulty)
+    base = hashlib.sha256(prefix)
+    nonce = start
+    attempts = 0
+    while limit is None or attempts < limit:
+        batch = CHECK_EVERY if limit is None else min(CHECK_EVERY, limit - attempts)
+        first = nonce
+        for nonce in range(first, first + batch * step, step):
+            h = base.copy()
+            h.update(str(nonce).encode())
+            if h.digest() < goal:
+                return nonce, attempts + (nonce - first) // step + 1
+        attempts += batch
+        nonce = first + batch * step
+        if _cancel is not None and _cancel.is_set():
+            break
+    return None, attempts
+
+
+def _init_worker(cancel):
+    global _cancel
+    _cancel = cancel
+
+
+class Miner:
+    """Reusable process pool for nonce searches; use as a context manager or close() it"""
+
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        self._cancel = None
+        self._pool = None
+        if self.workers > 1:
+            self._cancel = multiprocessing.Event()
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                             initargs=(self._cancel,))
+
+    def mine(self, prefix, difficulty):
+        """Return (nonce, attempts, seconds) for the first nonce found"""
+        began = time.perf_counter()
+        if self._pool is None:
+            nonce, attempts = search(prefix, difficulty)
+            return nonce, attempts, time.perf_counter() - began
+        self._cancel.clear()
+        futures = [self._pool.submit(search, prefix, difficulty, k, self.workers) for k in range(self.workers)]
+        found = None
+        pending = set(futures)
+        try:
+            while found is None and pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    nonce, _ = future.result()
+                    if nonce is not None and (found is None or nonce < found):
+                        found = nonce
+        finally:
+            # Also on errors and interrupts, or the other workers would search forever.
+            self._cancel.set()
+        attempts = sum(future.result()[1] for future in futures)
+        return found, attempts, time.perf_counter() - began
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def adjust_difficulty(difficulty, block_times, target_time, max_step=2, min_difficulty=1):
+    """Move difficulty toward target_time seconds per block, given recent block times
+
+    Each bit of difficulty doubles the expected work, so the change is
+    log2(target / average), rounded and clamped to max_step bits. The result
+    never drops below min_difficulty.
+    """
+    if not block_times:
+        return max(difficulty, min_difficulty)
+    average = max(sum(block_times) / len(block_times), 1e-6)
+    step = max(-max_step, min(max_step, round(math.log2(target_time / average))))
+    return max(min_difficulty, 1, min(MAX_DIFFICULTY, difficulty + step))
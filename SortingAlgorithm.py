@@ -1,8 +1,12 @@
 import tkinter as tk
 import time
-from tkinter import messagebox
+from tkinter import filedialog, messagebox
 from tkinter import font
 
+import SortingLoader
+from SortingEngine import (SWAP, WRITE, bubble_sort, counting_sort, heap_sort, insertion_sort, intro_sort,
+                           merge_sort, natural_merge_sort, radix_sort, selection_sort)
+
 window = tk.Tk()
 window.title("Sorting Algorithm Visualizer")
 window.geometry("1000x800")
@@ -14,113 +18,253 @@ canvas = tk.Canvas(window, width=800, height=500, bg="#B2EBF2", highlightthickne
 canvas.pack(pady=20)
 
 times_new_roman = font.Font(family="Times New Roman", size=12)
-def draw_data(highlight_indices=None):
-    canvas.delete("all")
-    bar_width = 25
-    spacing = 2
-    total_width = len(data) * (bar_width + spacing)
-    start_x = (800 - total_width) / 2
 
-    for i, val in enumerate(data):
-        x1 = start_x + i * (bar_width + spacing)
-        y1 = 400 - val * 3
-        x2 = x1 + bar_width
-        y2 = 400
-        color = "#FF5252" if highlight_indices and i in highlight_indices else "#00796B"
-        canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline="")
-        canvas.create_text((x1 + x2) / 2, y2 + 15, text=str(val), fill="#004D40", font=times_new_roman)
-    window.update()
-
-def insertion_sort():
-    global data
-    for i in range(1, len(data)):
-        key = data[i]
-        j = i - 1
-        while j >= 0 and key < data[j]:
-            data[j + 1] = data[j]
-            j -= 1
-            draw_data(highlight_indices=[j + 1])
-            time.sleep(0.5)
-        data[j + 1] = key
-        draw_data(highlight_indices=[j + 1])
-        time.sleep(0.05)
-    draw_data()
+BAR_COLOR = "#00796B"
+HIGHLIGHT_COLOR = "#FF5252"
+BASE_Y = 400
+MAX_BAR_HEIGHT = 380
+DISPLAY_LIMIT = 5000  # larger datasets are cut to their first DISPLAY_LIMIT values
+bars = []  # (rectangle id, text id or None) per data index, reused across frames
+bar_layout = {}
+highlighted = set()
 
-def bubble_sort():
-    global data
-    n = len(data)
-    for i in range(n):
-        for j in range(0, n - i - 1):
-            if data[j] > data[j + 1]:
-                data[j], data[j + 1] = data[j + 1], data[j]
-                draw_data(highlight_indices=[j, j + 1])
-                time.sleep(0.5)
-    draw_data()
 
-def selection_sort():
-    global data
+def draw_data(highlight_indices=None):
+    """Rebuild every bar from scratch; only needed when the dataset itself changes"""
+    canvas.delete("all")
+    bars.clear()
+    highlighted.clear()
     n = len(data)
-    for i in range(n):
-        min_index = i
-        for j in range(i + 1, n):
-            if data[j] < data[min_index]:
-                min_index = j
-        data[i], data[min_index] = data[min_index], data[i]
-        draw_data(highlight_indices=[i, min_index])
-        time.sleep(0.5)
+    pitch = min(27, 800 / max(n, 1))
+    spacing = 2 if pitch > 6 else 0
+    bar_layout.update(
+        pitch=pitch,
+        width=max(pitch - spacing, 1),
+        start_x=(800 - n * pitch) / 2,
+        scale=min(3, MAX_BAR_HEIGHT / max(max(data, default=1), 1)),
+        labels=pitch >= 20,
+    )
+    for i, val in enumerate(data):
+        x1, y1, x2, y2 = bar_coords(i, val)
+        color = HIGHLIGHT_COLOR if highlight_indices and i in highlight_indices else BAR_COLOR
+        if color == HIGHLIGHT_COLOR:
+            highlighted.add(i)
+        rect = canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline="")
+        text = None
+        if bar_layout["labels"]:
+            text = canvas.create_text((x1 + x2) / 2, y2 + 15, text=str(val), fill="#004D40", font=times_new_roman)
+        bars.append((rect, text))
+
+
+def bar_coords(i, val):
+    x1 = bar_layout["start_x"] + i * bar_layout["pitch"]
+    return x1, BASE_Y - val * bar_layout["scale"], x1 + bar_layout["width"], BASE_Y
+
+
+def update_bars(changed, highlight):
+    """Move only the bars whose values changed and recolour the highlighted ones"""
+    for i in changed:
+        rect, text = bars[i]
+        canvas.coords(rect, *bar_coords(i, data[i]))
+        if text is not None:
+            canvas.itemconfig(text, text=str(data[i]))
+    for i in highlighted - highlight:
+        canvas.itemconfig(bars[i][0], fill=BAR_COLOR)
+    for i in highlight - highlighted:
+        canvas.itemconfig(bars[i][0], fill=HIGHLIGHT_COLOR)
+    highlighted.clear()
+    highlighted.update(highlight)
+
+
+class SortAnimator:
+    """Plays algorithm steps from after() callbacks at a set number of steps per second
+
+    Steps due in the same frame are coalesced into a single canvas update, and a
+    frame stops consuming steps once FRAME_BUDGET seconds are spent so the UI stays
+    responsive at any speed.
+    """
+    FRAME_MS = 16
+    FRAME_BUDGET = 0.010
+
+    def __init__(self, root, render, speed=10.0):
+        self.root = root
+        self.render = render
+        self.speed = speed
+        self.steps = None
+        self.paused = False
+        self._after_id = None
+        self._credit = 0.0
+        self._last = 0.0
+
+    @property
+    def running(self):
+        return self.steps is not None
+
+    def start(self, steps):
+        self.stop()
+        self.steps = steps
+        self.paused = False
+        self._credit = 1.0  # show the first step immediately
+        self._last = time.perf_counter()
+        self._schedule()
+
+    def stop(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        if self.steps is not None:
+            self.steps.close()
+            self.steps = None
+
+    def toggle_pause(self):
+        self.paused = not self.paused
+        if not self.paused and self.running:
+            self._last = time.perf_counter()
+            self._schedule()
+        return self.paused
+
+    def step(self):
+        """Pause and advance exactly one step"""
+        self.paused = True
+        if self.running:
+            self._advance(1)
+
+    def _schedule(self):
+        if self._after_id is None:
+            self._after_id = self.root.after(self.FRAME_MS, self._frame)
+
+    def _frame(self):
+        self._after_id = None
+        if self.paused or not self.running:
+            return
+        now = time.perf_counter()
+        self._credit += (now - self._last) * self.speed
+        self._last = now
+        due = int(self._credit)
+        self._credit -= due
+        if due:
+            self._advance(due, deadline=now + self.FRAME_BUDGET)
+        if self.running:
+            self._schedule()
+
+    def _advance(self, count, deadline=None):
+        changed = set()
+        highlight = set()
+        done = False
+        for n in range(count):
+            event = next(self.steps, None)
+            if event is None:
+                done = True
+                break
+            kind = event[0]
+            if kind == SWAP:
+                changed.update(event[1:])
+                highlight = {event[1], event[2]}
+            elif kind == WRITE:
+                changed.add(event[1])
+                highlight = {event[1]}
+            else:
+                highlight = {event[1], event[2]}
+            if deadline is not None and n & 255 == 255 and time.perf_counter() > deadline:
+                self._credit = 0.0  # fell behind; don't try to catch up next frame
+                break
+        if done:
+            self.steps = None
+            highlight = set()
+        self.render(changed, highlight)
+
+
+animator = SortAnimator(window, update_bars)
+
+
+def run_sort(algorithm):
+    if not data:
+        return
+    try:
+        steps = algorithm(data)
+    except ValueError as exc:
+        messagebox.showerror("Cannot Sort", str(exc))
+        return
     draw_data()
+    animator.start(steps)
+    pause_button.config(text="Pause")
 
 
-def heapify(n, i):
-    largest = i
-    left = 2 * i + 1
-    right = 2 * i + 2
+def toggle_pause():
+    pause_button.config(text="Resume" if animator.toggle_pause() else "Pause")
 
-    if left < n and data[left] > data[largest]:
-        largest = left
 
-    if right < n and data[right] > data[largest]:
-        largest = right
+def step_sort():
+    animator.step()
+    pause_button.config(text="Resume")
 
-    if largest != i:
-        data[i], data[largest] = data[largest], data[i]
-        draw_data(highlight_indices=[i, largest])
-        time.sleep(0.5)
-        heapify(n, largest)
 
+def set_speed(position):
+    animator.speed = 10 ** (float(position) / 25)
+    speed_label.config(text=f"{animator.speed:,.0f} steps/s" if animator.speed >= 10 else f"{animator.speed:.1f} steps/s")
 
-def heap_sort():
-    global data
-    n = len(data)
-    for i in range(n // 2 - 1, -1, -1):
-        heapify(n, i)
-    for i in range(n - 1, 0, -1):
-        data[i], data[0] = data[0], data[i]
-        draw_data(highlight_indices=[i, 0])
-        time.sleep(0.5)
-        heapify(i, 0)
 
+def set_data(values):
+    """Show a new dataset; values may be a list or a SortingLoader array"""
+    global data
+    animator.stop()
+    shown = values[:DISPLAY_LIMIT]
+    data = shown.tolist() if hasattr(shown, "tolist") else list(shown)
+    error_label.config(text=f"Showing the first {DISPLAY_LIMIT:,} of {len(values):,} values."
+                       if len(values) > DISPLAY_LIMIT else "")
     draw_data()
 
 
 def process_input_data():
-    global data
     input_data = entry_data.get()
     try:
-        data = [int(x.strip()) for x in input_data.split(',')]
-        if len(data) == 0:
+        values = SortingLoader.parse_block(input_data.encode())
+        if len(values) == 0:
             raise ValueError
-        draw_data()
+        set_data(values)
     except ValueError:
         messagebox.showerror("Invalid Input", "Invalid input! Please enter numbers separated by commas.")
 
 
+def load_file():
+    path = filedialog.askopenfilename(title="Load integers", filetypes=[
+        ("Text (comma or newline separated)", "*.txt *.csv"),
+        ("Raw int32", "*.i32 *.int32"),
+        ("Raw int64", "*.i64 *.int64 *.bin"),
+        ("All files", "*"),
+    ])
+    if not path:
+        return
+    try:
+        values = SortingLoader.load(path)
+    except (OSError, ValueError) as exc:
+        messagebox.showerror("Load Failed", f"Could not load {path}: {exc}")
+        return
+    if len(values) == 0:
+        messagebox.showerror("Load Failed", f"{path} contains no numbers.")
+        return
+    set_data(values)
+
+
+def generate_data():
+    try:
+        n = int(size_entry.get())
+        if not 0 < n <= DISPLAY_LIMIT:
+            raise ValueError
+    except ValueError:
+        messagebox.showerror("Invalid Size", f"Size must be a whole number from 1 to {DISPLAY_LIMIT:,}.")
+        return
+    set_data(SortingLoader.generate(distribution.get(), n, seed=int(time.time())))
+
+
 def clear_data():
     global data
+    animator.stop()
     data = []
     entry_data.delete(0, tk.END)
     error_label.config(text="")
     canvas.delete("all")
+    bars.clear()
 
 
 frame = tk.Frame(window, bg="#E0F7FA")
@@ -136,29 +280,92 @@ process_button = tk.Button(frame, text="Submit Input", command=process_input_dat
                            font=times_new_roman, relief="flat")
 process_button.grid(row=0, column=2, padx=10, pady=10)
 
+load_button = tk.Button(frame, text="Load File...", command=load_file, bg="#00796B", fg="#FFFFFF",
+                        font=times_new_roman, relief="flat")
+load_button.grid(row=0, column=3, padx=10, pady=10)
+
+generate_frame = tk.Frame(frame, bg="#E0F7FA")
+generate_frame.grid(row=1, column=0, columnspan=4, pady=5)
+
+distribution = tk.StringVar(value=SortingLoader.DISTRIBUTIONS[0])
+distribution_menu = tk.OptionMenu(generate_frame, distribution, *SortingLoader.DISTRIBUTIONS)
+distribution_menu.config(bg="#FFFFFF", fg="#004D40", font=times_new_roman, relief="flat", highlightthickness=0)
+distribution_menu.grid(row=0, column=0, padx=5)
+
+size_label = tk.Label(generate_frame, text="Size:", bg="#E0F7FA", font=times_new_roman)
+size_label.grid(row=0, column=1, padx=5)
+
+size_entry = tk.Entry(generate_frame, width=8, font=times_new_roman, bg="#FFFFFF", fg="#004D40", relief="flat")
+size_entry.insert(0, "30")
+size_entry.grid(row=0, column=2, padx=5)
+
+generate_button = tk.Button(generate_frame, text="Generate", command=generate_data, bg="#00796B", fg="#FFFFFF",
+                            font=times_new_roman, relief="flat")
+generate_button.grid(row=0, column=3, padx=5)
+
 button_frame = tk.Frame(window, bg="#E0F7FA")
 button_frame.pack(pady=10)
 
-bubble_button = tk.Button(button_frame, text="Bubble Sort", command=bubble_sort, bg="#00796B", fg="#FFFFFF",
+bubble_button = tk.Button(button_frame, text="Bubble Sort", command=lambda: run_sort(bubble_sort), bg="#00796B", fg="#FFFFFF",
                           font=times_new_roman, relief="flat")
 bubble_button.grid(row=0, column=0, padx=5, pady=5)
 
-selection_button = tk.Button(button_frame, text="Selection Sort", command=selection_sort, bg="#00796B", fg="#FFFFFF",
+selection_button = tk.Button(button_frame, text="Selection Sort", command=lambda: run_sort(selection_sort), bg="#00796B", fg="#FFFFFF",
                              font=times_new_roman, relief="flat")
 selection_button.grid(row=0, column=1, padx=5, pady=5)
 
-heap_button = tk.Button(button_frame, text="Heap Sort", command=heap_sort, bg="#00796B", fg="#FFFFFF",
+heap_button = tk.Button(button_frame, text="Heap Sort", command=lambda: run_sort(heap_sort), bg="#00796B", fg="#FFFFFF",
                         font=times_new_roman, relief="flat")
 heap_button.grid(row=0, column=2, padx=5, pady=5)
 
-insertion_button = tk.Button(button_frame, text="Insertion Sort", command=insertion_sort, bg="#00796B", fg="#FFFFFF",
+insertion_button = tk.Button(button_frame, text="Insertion Sort", command=lambda: run_sort(insertion_sort), bg="#00796B", fg="#FFFFFF",
                              font=times_new_roman, relief="flat")
 insertion_button.grid(row=0, column=3, padx=5, pady=5)
 
+merge_button = tk.Button(button_frame, text="Merge Sort", command=lambda: run_sort(merge_sort), bg="#00796B", fg="#FFFFFF",
+                         font=times_new_roman, relief="flat")
+merge_button.grid(row=1, column=0, padx=5, pady=5)
+
+intro_button = tk.Button(button_frame, text="Intro Sort", command=lambda: run_sort(intro_sort), bg="#00796B", fg="#FFFFFF",
+                         font=times_new_roman, relief="flat")
+intro_button.grid(row=1, column=1, padx=5, pady=5)
+
+natural_button = tk.Button(button_frame, text="Natural Merge Sort", command=lambda: run_sort(natural_merge_sort), bg="#00796B",
+                           fg="#FFFFFF", font=times_new_roman, relief="flat")
+natural_button.grid(row=1, column=2, padx=5, pady=5)
+
+radix_button = tk.Button(button_frame, text="Radix Sort", command=lambda: run_sort(radix_sort), bg="#00796B", fg="#FFFFFF",
+                         font=times_new_roman, relief="flat")
+radix_button.grid(row=1, column=3, padx=5, pady=5)
+
+counting_button = tk.Button(button_frame, text="Counting Sort", command=lambda: run_sort(counting_sort), bg="#00796B", fg="#FFFFFF",
+                            font=times_new_roman, relief="flat")
+counting_button.grid(row=1, column=4, padx=5, pady=5)
+
 clear_button = tk.Button(button_frame, text="Clear", command=clear_data, bg="#FF5252", fg="#FFFFFF",
                          font=times_new_roman, relief="flat")
 clear_button.grid(row=0, column=4, padx=5, pady=5)
 
+control_frame = tk.Frame(window, bg="#E0F7FA")
+control_frame.pack(pady=5)
+
+pause_button = tk.Button(control_frame, text="Pause", command=toggle_pause, bg="#00796B", fg="#FFFFFF",
+                         font=times_new_roman, relief="flat", width=8)
+pause_button.grid(row=0, column=0, padx=5, pady=5)
+
+step_button = tk.Button(control_frame, text="Step", command=step_sort, bg="#00796B", fg="#FFFFFF",
+                        font=times_new_roman, relief="flat", width=8)
+step_button.grid(row=0, column=1, padx=5, pady=5)
+
+speed_scale = tk.Scale(control_frame, from_=0, to=125, orient=tk.HORIZONTAL, showvalue=False, length=250,
+                       label="Speed", command=set_speed, bg="#E0F7FA", font=times_new_roman, highlightthickness=0)
+speed_scale.grid(row=0, column=2, padx=10, pady=5)
+
+speed_label = tk.Label(control_frame, text="", bg="#E0F7FA", font=times_new_roman, width=16)
+speed_label.grid(row=0, column=3, padx=5, pady=5)
+speed_scale.set(25)
+set_speed(speed_scale.get())
+
 error_label = tk.Label(window, text="", fg="#FF5252", bg="#E0F7FA", font=times_new_roman)
 error_label.pack()
 
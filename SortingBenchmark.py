@@ -0,0 +1,269 @@
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+from array import array
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+import SortingEngine
+import SortingLoader
+from ExternalSort import external_sort
+from ParallelSort import parallel_sort
+from SortingLoader import DISTRIBUTIONS
+
+try:
+    import numpy as np
+    import SortingVectorized
+except ImportError:
+    np = None
+    SortingVectorized = None
+
+# Algorithms doing O(n^2) steps (or, for odd-even, O(n) full-array phases); skipped above --quadratic-limit.
+QUADRATIC = {"Bubble Sort", "Selection Sort", "Insertion Sort", "Odd-Even Transposition (numpy)"}
+
+FIELDS = ("algorithm", "distribution", "size", "seconds", "comparisons", "swaps", "writes")
+
+
+def make_data(distribution, n, seed=0):
+    return SortingLoader.generate(distribution, n, seed).tolist()
+
+
+def backends():
+    """Yield (name, runner) pairs; a runner sorts a fresh copy of a list and returns the step counts"""
+    for name, algorithm in SortingEngine.ALGORITHMS.items():
+        yield name, lambda data, algorithm=algorithm: _run_engine(algorithm, data)
+    if SortingVectorized is not None:
+        for name, algorithm in SortingVectorized.ALGORITHMS.items():
+            yield name, lambda data, algorithm=algorithm: _run_vectorized(algorithm, data)
+
+
+def _run_engine(algorithm, data):
+    data = list(data)
+    began = time.perf_counter()
+    counts = SortingEngine.count_operations(algorithm, data)
+    return time.perf_counter() - began, counts, data
+
+
+def _run_vectorized(algorithm, data):
+    array = np.array(data, dtype=np.int64)
+    began = time.perf_counter()
+    counts = algorithm(array)
+    return time.perf_counter() - began, counts, array.tolist()
+
+
+def run(algorithms, distributions, sizes, quadratic_limit, seed=0, check=True):
+    for size in sizes:
+        for distribution in distributions:
+            data = make_data(distribution, size, seed)
+            expected = sorted(data) if check else None
+            for name, runner in backends():
+                if algorithms and name not in algorithms:
+                    continue
+                if name in QUADRATIC and size > quadratic_limit:
+                    continue
+                seconds, counts, result = runner(data)
+                if check and result != expected:
+                    raise AssertionError(f"{name} mis-sorted {distribution} input of size {size}")
+                yield {
+                    "algorithm": name,
+                    "distribution": distribution,
+                    "size": size,
+                    "seconds": seconds,
+                    "comparisons": counts[SortingEngine.COMPARE],
+                    "swaps": counts[SortingEngine.SWAP],
+                    "writes": counts[SortingEngine.WRITE],
+                }
+
+
+def print_table(rows):
+    print(f"{'algorithm':<32} | {'distribution':<13} | {'size':>10} | {'seconds':>9} | "
+          f"{'comparisons':>13} | {'swaps':>13} | {'writes':>13}")
+    print("-" * 124)
+    for row in rows:
+        print(f"{row['algorithm']:<32} | {row['distribution']:<13} | {row['size']:>10,} | {row['seconds']:>9.4f} | "
+              f"{row['comparisons']:>13,} | {row['swaps']:>13,} | {row['writes']:>13,}", flush=True)
+
+
+def run_algorithms(args):
+    rows = run(args.algorithms, args.distributions, args.sizes, args.quadratic_limit,
+               seed=args.seed, check=not args.no_check)
+    if args.csv:
+        writer = csv.DictWriter(sys.stdout, fieldnames=FIELDS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+    else:
+        print_table(rows)
+
+
+def _timed(fn):
+    began = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - began
+
+
+def run_parallel(args):
+    data = make_data(args.distribution, args.size, args.seed)
+    expected = sorted(data)
+    baseline, base_time = _timed(lambda: SortingEngine.sort(SortingEngine.heap_sort, list(data)))
+    assert baseline == expected
+    print(f"{args.size:,} {args.distribution} integers; baseline heap_sort in one process: {base_time:.3f}s")
+    print(f"{'workers':>7} | {'chunk algorithm':<15} | {'seconds':>9} | {'speedup vs heap_sort':>20}")
+    print("-" * 62)
+    for workers in args.workers:
+        for algorithm in ("Heap Sort", None):
+            result, seconds = _timed(lambda: parallel_sort(data, workers=workers, chunk_size=args.chunk_size,
+                                                           algorithm=algorithm))
+            assert result == expected
+            print(f"{workers:>7} | {algorithm or 'list.sort':<15} | {seconds:>9.3f} | {base_time / seconds:>19.2f}x",
+                  flush=True)
+
+
+def write_random_file(path, size_bytes, fmt, seed=0, block_items=1 << 17):
+    """Fill path with about size_bytes of random integers in the given format"""
+    rng = random.Random(seed)
+    written = 0
+    with open(path, 'wb') as f:
+        while written < size_bytes:
+            if fmt == "int64":
+                block = array('q', (rng.getrandbits(64) - 2**63 for _ in range(block_items)))
+                if sys.byteorder != 'little':
+                    block.byteswap()
+                block = block.tobytes()
+            else:
+                block = ("\n".join(str(rng.getrandbits(40)) for _ in range(block_items)) + "\n").encode()
+            f.write(block[:size_bytes - written] if fmt == "text" else block)
+            written += len(block)
+    if fmt == "text":
+        # Cutting a block may have split the final number; drop it.
+        with open(path, 'rb+') as f:
+            data_end = f.seek(0, os.SEEK_END)
+            f.seek(max(0, data_end - 64))
+            tail = f.read()
+            f.truncate(data_end - len(tail) + tail.rfind(b"\n") + 1)
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return float('nan')
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def run_external(args):
+    with tempfile.TemporaryDirectory(dir=args.tmp_dir, prefix="extsort-bench-") as workdir:
+        source = os.path.join(workdir, "input")
+        output = os.path.join(workdir, "output")
+        began = time.perf_counter()
+        write_random_file(source, int(args.size_mb * 2**20), args.format, args.seed)
+        size = os.path.getsize(source)
+        print(f"generated {size / 2**20:,.0f} MB of {args.format} input in {time.perf_counter() - began:.1f}s")
+        print(f"{'memory budget':>13} | {'fan-in':>6} | {'values':>13} | {'seconds':>8} | {'MB/s':>7} | {'peak RSS':>9}")
+        print("-" * 72)
+        for budget in args.memory_mb:
+            count, seconds = _timed(lambda: external_sort(source, output, memory_budget=int(budget * 2**20),
+                                                            fmt=args.format, tmp_dir=workdir, fan_in=args.fan_in))
+            print(f"{budget:>10,.0f} MB | {args.fan_in:>6} | {count:>13,} | {seconds:>8.1f} | "
+                  f"{size / 2**20 / seconds:>7.1f} | {_peak_rss_mb():>6.0f} MB", flush=True)
+            if args.check:
+                previous = None
+                for chunk in SortingLoader.iter_chunks(output, args.format):
+                    for value in chunk.tolist():
+                        assert previous is None or previous <= value, "output is not sorted"
+                        previous = value
+
+
+# name -> (loader format, text separator, approximate bytes per value)
+LOADER_FILES = {
+    "csv": ("text", ",", 11),
+    "lines": ("text", "\n", 11),
+    "int32": ("int32", None, 4),
+    "int64": ("int64", None, 8),
+}
+
+
+def _count_chunks(chunks):
+    # Reduce every chunk so memory-mapped pages are actually read.
+    count = 0
+    for chunk in chunks:
+        count += len(chunk)
+        max(chunk) if np is None else chunk.max(initial=0)
+    return count
+
+
+def run_loader(args):
+    with tempfile.TemporaryDirectory(dir=args.tmp_dir, prefix="loader-bench-") as workdir:
+        print(f"{'file':<6} | {'parser':<24} | {'values':>12} | {'MB':>7} | {'seconds':>8} | {'MB/s':>8}")
+        print("-" * 80)
+        for name in args.formats:
+            fmt, separator, item_bytes = LOADER_FILES[name]
+            path = os.path.join(workdir, name)
+            values = SortingLoader.generate("random", int(args.size_mb * 2**20) // item_bytes, args.seed,
+                                            high=2**31 - 1)
+            SortingLoader.save(path, values, fmt, separator=separator)
+            del values
+            size = os.path.getsize(path) / 2**20
+            parsers = [("SortingLoader (chunked)", lambda: _count_chunks(SortingLoader.iter_chunks(path, fmt))),
+                       ("SortingLoader.load", lambda: len(SortingLoader.load(path, fmt)))]
+            if fmt == "text":
+                parsers.append(("split + int()", lambda: len([int(x) for x in open(path).read().split(separator)
+                                                              if x])))
+            for parser, parse in parsers:
+                count, seconds = _timed(parse)
+                print(f"{name:<6} | {parser:<24} | {count:>12,} | {size:>7.1f} | {seconds:>8.3f} | "
+                      f"{size / seconds:>8.1f}", flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sorting benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    algorithms = sub.add_parser("algorithms", help="every algorithm over several input distributions")
+    algorithms.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    algorithms.add_argument("--distributions", nargs="+", choices=DISTRIBUTIONS, default=list(DISTRIBUTIONS))
+    algorithms.add_argument("--algorithms", nargs="+", help="algorithm names to run (default: all available)")
+    algorithms.add_argument("--quadratic-limit", type=int, default=5_000,
+                            help="largest input given to O(n^2) algorithms")
+    algorithms.add_argument("--seed", type=int, default=0)
+    algorithms.add_argument("--csv", action="store_true", help="write CSV to stdout instead of a table")
+    algorithms.add_argument("--no-check", action="store_true", help="skip verifying each result against sorted()")
+    algorithms.set_defaults(func=run_algorithms)
+
+    parallel = sub.add_parser("parallel", help="process-pool parallel sort speedup over single-process heap_sort")
+    parallel.add_argument("--size", type=int, default=200_000)
+    parallel.add_argument("--distribution", choices=DISTRIBUTIONS, default="random")
+    parallel.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parallel.add_argument("--chunk-size", type=int, help="elements per task (default: one chunk per worker)")
+    parallel.add_argument("--seed", type=int, default=0)
+    parallel.set_defaults(func=run_parallel)
+
+    external = sub.add_parser("external", help="external merge sort of a generated file larger than the budget")
+    external.add_argument("--size-mb", type=float, default=256, help="input size; use several GB for a full run")
+    external.add_argument("--memory-mb", type=float, nargs="+", default=[16, 64])
+    external.add_argument("--format", choices=["int64", "text"], default="int64")
+    external.add_argument("--fan-in", type=int, default=64)
+    external.add_argument("--tmp-dir", help="where to put the input, runs and output (default: system temp)")
+    external.add_argument("--seed", type=int, default=0)
+    external.add_argument("--check", action="store_true", help="verify the output is sorted")
+    external.set_defaults(func=run_external)
+
+    loader = sub.add_parser("loader", help="parse throughput of the dataset loader per file format")
+    loader.add_argument("--size-mb", type=float, default=64)
+    loader.add_argument("--formats", nargs="+", choices=list(LOADER_FILES), default=list(LOADER_FILES))
+    loader.add_argument("--tmp-dir", help="where to write the generated files (default: system temp)")
+    loader.add_argument("--seed", type=int, default=0)
+    loader.set_defaults(func=run_loader)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
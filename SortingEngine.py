@@ -0,0 +1,338 @@
+"""Headless sorting algorithms written as step generators.
+
+Each algorithm sorts a mutable sequence in place and yields one event per
+elementary operation, after performing it:
+
+    (COMPARE, i, j)     seq[i] and seq[j] were compared
+    (SWAP, i, j)        seq[i] and seq[j] were exchanged
+    (WRITE, i, value)   value was stored at seq[i]
+
+Consumers decide what to do with the steps: the Tk visualizer draws them,
+count_operations() tallies them, and sort() just runs them to completion.
+"""
+from collections import deque
+
+COMPARE = "compare"
+SWAP = "swap"
+WRITE = "write"
+
+# counting_sort refuses value ranges wider than both of these.
+COUNTING_RANGE_FACTOR = 16
+MIN_COUNTING_RANGE = 1 << 16
+
+
+def bubble_sort(seq):
+    n = len(seq)
+    for i in range(n):
+        for j in range(0, n - i - 1):
+            yield COMPARE, j, j + 1
+            if seq[j] > seq[j + 1]:
+                seq[j], seq[j + 1] = seq[j + 1], seq[j]
+                yield SWAP, j, j + 1
+
+
+def _insertion_range(seq, lo, hi):
+    for i in range(lo + 1, hi):
+        key = seq[i]
+        j = i - 1
+        while j >= lo:
+            yield COMPARE, j, j + 1
+            if not key < seq[j]:
+                break
+            seq[j + 1] = seq[j]
+            yield WRITE, j + 1, seq[j + 1]
+            j -= 1
+        seq[j + 1] = key
+        yield WRITE, j + 1, key
+
+
+def insertion_sort(seq):
+    yield from _insertion_range(seq, 0, len(seq))
+
+
+def selection_sort(seq):
+    n = len(seq)
+    for i in range(n):
+        min_index = i
+        for j in range(i + 1, n):
+            yield COMPARE, j, min_index
+            if seq[j] < seq[min_index]:
+                min_index = j
+        if min_index != i:
+            seq[i], seq[min_index] = seq[min_index], seq[i]
+            yield SWAP, i, min_index
+
+
+def heapify(seq, n, i, lo=0):
+    """Sift seq[lo + i] down a max-heap of n items rooted at seq[lo]"""
+    while True:
+        largest = i
+        left = 2 * i + 1
+        right = 2 * i + 2
+
+        if left < n:
+            yield COMPARE, lo + left, lo + largest
+            if seq[lo + left] > seq[lo + largest]:
+                largest = left
+
+        if right < n:
+            yield COMPARE, lo + right, lo + largest
+            if seq[lo + right] > seq[lo + largest]:
+                largest = right
+
+        if largest == i:
+            return
+        seq[lo + i], seq[lo + largest] = seq[lo + largest], seq[lo + i]
+        yield SWAP, lo + i, lo + largest
+        i = largest
+
+
+def _heap_sort_range(seq, lo, hi):
+    n = hi - lo
+    for i in range(n // 2 - 1, -1, -1):
+        yield from heapify(seq, n, i, lo)
+    for i in range(n - 1, 0, -1):
+        seq[lo + i], seq[lo] = seq[lo], seq[lo + i]
+        yield SWAP, lo + i, lo
+        yield from heapify(seq, i, 0, lo)
+
+
+def heap_sort(seq):
+    yield from _heap_sort_range(seq, 0, len(seq))
+
+
+def _merge(seq, lo, mid, hi, buf):
+    """Stable merge of the sorted runs seq[lo:mid] and seq[mid:hi] through buf"""
+    buf[:] = seq[lo:mid]
+    i, j, k = 0, mid, lo
+    left_len = mid - lo
+    while i < left_len and j < hi:
+        yield COMPARE, lo + i, j
+        if seq[j] < buf[i]:
+            seq[k] = seq[j]
+            j += 1
+        else:
+            seq[k] = buf[i]
+            i += 1
+        yield WRITE, k, seq[k]
+        k += 1
+    while i < left_len:
+        seq[k] = buf[i]
+        yield WRITE, k, seq[k]
+        i += 1
+        k += 1
+
+
+def merge_sort(seq):
+    """Bottom-up (iterative) merge sort"""
+    n = len(seq)
+    buf = []
+    width = 1
+    while width < n:
+        for lo in range(0, n - width, 2 * width):
+            mid = lo + width
+            hi = min(lo + 2 * width, n)
+            yield COMPARE, mid - 1, mid
+            if seq[mid] < seq[mid - 1]:
+                yield from _merge(seq, lo, mid, hi, buf)
+        width *= 2
+
+
+INSERTION_CUTOFF = 16
+
+
+def _median_of_three(seq, lo, hi):
+    """Order seq[lo], seq[mid], seq[hi] and park the median at hi - 1"""
+    mid = (lo + hi) // 2
+    for a, b in ((lo, mid), (mid, hi), (lo, mid)):
+        yield COMPARE, a, b
+        if seq[b] < seq[a]:
+            seq[a], seq[b] = seq[b], seq[a]
+            yield SWAP, a, b
+    seq[mid], seq[hi - 1] = seq[hi - 1], seq[mid]
+    yield SWAP, mid, hi - 1
+
+
+def intro_sort(seq):
+    """Quicksort with median-of-three pivots, an insertion-sort cutoff for short
+    ranges and a heap-sort fallback once recursion depth passes 2 log2(n)"""
+    n = len(seq)
+    stack = [(0, n - 1, 2 * max(n, 1).bit_length())]
+    while stack:
+        lo, hi, depth = stack.pop()
+        if hi - lo + 1 <= INSERTION_CUTOFF:
+            yield from _insertion_range(seq, lo, hi + 1)
+            continue
+        if depth == 0:
+            yield from _heap_sort_range(seq, lo, hi + 1)
+            continue
+        yield from _median_of_three(seq, lo, hi)
+        pivot = seq[hi - 1]
+        i, j = lo, hi - 1
+        while True:
+            i += 1
+            yield COMPARE, i, hi - 1
+            while seq[i] < pivot:
+                i += 1
+                yield COMPARE, i, hi - 1
+            j -= 1
+            yield COMPARE, j, hi - 1
+            while pivot < seq[j]:
+                j -= 1
+                yield COMPARE, j, hi - 1
+            if i >= j:
+                break
+            seq[i], seq[j] = seq[j], seq[i]
+            yield SWAP, i, j
+        seq[i], seq[hi - 1] = seq[hi - 1], seq[i]
+        yield SWAP, i, hi - 1
+        # Push the larger side first so the stack stays O(log n) deep.
+        left, right = (lo, i - 1, depth - 1), (i + 1, hi, depth - 1)
+        if i - lo > hi - i:
+            stack.extend((left, right))
+        else:
+            stack.extend((right, left))
+
+
+MIN_RUN = 32
+
+
+def natural_merge_sort(seq):
+    """Timsort-style sort: detect natural runs, extend short ones with insertion
+    sort to MIN_RUN, and merge them under the Timsort stack invariants"""
+    n = len(seq)
+    runs = []
+    buf = []
+    lo = 0
+    while lo < n:
+        hi = lo + 1
+        if hi < n:
+            yield COMPARE, lo, hi
+            descending = seq[hi] < seq[lo]
+            hi += 1
+            while hi < n:
+                yield COMPARE, hi - 1, hi
+                if (seq[hi] < seq[hi - 1]) != descending:
+                    break
+                hi += 1
+            if descending:
+                # Strictly descending runs can be reversed without breaking stability.
+                a, b = lo, hi - 1
+                while a < b:
+                    seq[a], seq[b] = seq[b], seq[a]
+                    yield SWAP, a, b
+                    a += 1
+                    b -= 1
+        if hi - lo < MIN_RUN and hi < n:
+            hi = min(lo + MIN_RUN, n)
+            yield from _insertion_range(seq, lo, hi)
+        runs.append((lo, hi))
+        lo = hi
+        while len(runs) > 1:
+            if len(runs) > 2 and _run_len(runs[-3]) <= _run_len(runs[-2]) + _run_len(runs[-1]):
+                if _run_len(runs[-3]) < _run_len(runs[-1]):
+                    yield from _merge_runs(seq, runs, -3, buf)
+                else:
+                    yield from _merge_runs(seq, runs, -2, buf)
+            elif _run_len(runs[-2]) <= _run_len(runs[-1]):
+                yield from _merge_runs(seq, runs, -2, buf)
+            else:
+                break
+    while len(runs) > 1:
+        yield from _merge_runs(seq, runs, -2, buf)
+
+
+def _run_len(run):
+    return run[1] - run[0]
+
+
+def _merge_runs(seq, runs, at, buf):
+    """Merge runs[at] with the run after it, replacing both on the run stack"""
+    (lo, mid), (_, hi) = runs[at], runs[at + 1]
+    yield from _merge(seq, lo, mid, hi, buf)
+    runs[at:at + 2 or None] = [(lo, hi)]
+
+
+def counting_sort(seq):
+    """Counting sort for integers; uses O(max - min) extra space
+
+    Raises ValueError before the first step when the value range is far wider
+    than the input (more than COUNTING_RANGE_FACTOR * len(seq) values, and
+    more than MIN_COUNTING_RANGE); radix_sort handles such inputs.
+    """
+    if len(seq) < 2:
+        return iter(())
+    low, high = min(seq), max(seq)
+    span = high - low + 1
+    if span > max(COUNTING_RANGE_FACTOR * len(seq), MIN_COUNTING_RANGE):
+        raise ValueError(f"Counting sort would need {span:,} counters for {len(seq):,} values; "
+                         f"use radix sort for wide ranges")
+    return _counting_sort(seq, low, span)
+
+
+def _counting_sort(seq, low, span):
+    counts = [0] * span
+    for value in seq:
+        counts[value - low] += 1
+    k = 0
+    for offset, count in enumerate(counts):
+        for _ in range(count):
+            seq[k] = low + offset
+            yield WRITE, k, seq[k]
+            k += 1
+
+
+def radix_sort(seq, base=256):
+    """Stable LSD radix sort for integers, one counting pass per base-`base` digit"""
+    n = len(seq)
+    if n < 2:
+        return
+    low = min(seq)
+    keys = [value - low for value in seq]
+    top = max(keys)
+    shift = 1
+    while top // shift > 0:
+        counts = [0] * base
+        for key in keys:
+            counts[key // shift % base] += 1
+        total = 0
+        for digit in range(base):
+            counts[digit], total = total, total + counts[digit]
+        ordered = [0] * n
+        for key in keys:
+            digit = key // shift % base
+            ordered[counts[digit]] = key
+            counts[digit] += 1
+        keys = ordered
+        for i, key in enumerate(keys):
+            if seq[i] != key + low:
+                seq[i] = key + low
+                yield WRITE, i, seq[i]
+        shift *= base
+
+
+ALGORITHMS = {
+    "Bubble Sort": bubble_sort,
+    "Selection Sort": selection_sort,
+    "Heap Sort": heap_sort,
+    "Insertion Sort": insertion_sort,
+    "Merge Sort": merge_sort,
+    "Intro Sort": intro_sort,
+    "Natural Merge Sort": natural_merge_sort,
+    "Radix Sort": radix_sort,
+    "Counting Sort": counting_sort,
+}
+
+
+def sort(algorithm, seq):
+    """Run algorithm over seq to completion at full speed and return seq"""
+    deque(algorithm(seq), maxlen=0)
+    return seq
+
+
+def count_operations(algorithm, seq):
+    """Sort seq in place and return how many compares, swaps and writes it took"""
+    counts = {COMPARE: 0, SWAP: 0, WRITE: 0}
+    for event in algorithm(seq):
+        counts[event[0]] += 1
+    return counts
@@ -0,0 +1,193 @@
+"""Loading and generating integer datasets for the sorting tools.
+
+Text files may separate integers with commas, spaces or newlines in any mix.
+They are read in fixed-size blocks: separators are mapped to spaces with
+bytes.translate and, when NumPy is available, each block is parsed in C by
+np.fromstring, so no per-number string objects are created. Raw int32/int64
+files are memory-mapped with np.memmap (or read into an array.array when
+NumPy is missing).
+
+Chunks and loaded datasets are NumPy arrays when NumPy is installed (int32
+memory-map chunks keep their file dtype) and array('q') otherwise; both have
+len(), indexing and .tolist().
+"""
+import os
+import random
+import sys
+import warnings
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+else:
+    _INT64 = np.iinfo(np.int64)
+
+DISTRIBUTIONS = ("random", "sorted", "reversed", "few-unique", "nearly-sorted", "zipf")
+BINARY_FORMATS = {"int32": ('i', "<i4"), "int64": ('q', "<i8")}
+EXTENSIONS = {".i32": "int32", ".int32": "int32", ".i64": "int64", ".int64": "int64", ".bin": "int64"}
+
+_SEPARATORS = bytes.maketrans(b",\t\r\n\f\v", b"      ")
+# Raw files are little-endian; array.array uses the machine's byte order.
+_SWAP_BYTES = sys.byteorder != 'little'
+
+
+def detect_format(path):
+    return EXTENSIONS.get(os.path.splitext(path)[1].lower(), "text")
+
+
+def parse_block(block):
+    """Parse one block of comma/whitespace-separated integers"""
+    return _parse(block.translate(_SEPARATORS))
+
+
+def _parse(block):
+    # np.fromstring reads a separator-only block as [0], so skip those.
+    if not block.strip(b' '):
+        return array('q') if np is None else np.empty(0, dtype=np.int64)
+    if np is None:
+        return _parse_exact(block)
+    with warnings.catch_warnings():
+        # NumPy only warns when it stops at a bad token; treat that as an error.
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            values = np.fromstring(block, dtype=np.int64, sep=' ')
+        except DeprecationWarning as exc:
+            raise ValueError(f"invalid integer data: {exc}") from None
+    # NumPy clamps out-of-range tokens to the int64 limits without a warning,
+    # so a block that hits either limit is re-parsed exactly.
+    if values.size and (values.max() == _INT64.max or values.min() == _INT64.min):
+        values = np.frombuffer(_parse_exact(block), dtype=np.int64).copy()
+    return values
+
+
+def _parse_exact(block):
+    try:
+        return array('q', map(int, block.split()))
+    except OverflowError:
+        raise ValueError("integer out of the int64 range") from None
+
+
+def iter_text_chunks(path, block_size=1 << 22):
+    """Yield the integers of a text file as arrays, one per block read"""
+    with open(path, 'rb') as f:
+        tail = b''
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            block = tail + block.translate(_SEPARATORS)
+            # Anything after the last separator may continue in the next block.
+            cut = block.rfind(b' ') + 1
+            tail = block[cut:]
+            if cut:
+                yield _parse(block[:cut])
+        if tail:
+            yield _parse(tail)
+
+
+def iter_binary_chunks(path, fmt="int64", chunk_items=1 << 20):
+    """Yield the integers of a raw little-endian int32/int64 file in chunks
+
+    With NumPy the chunks are zero-copy views of a read-only memory map.
+    """
+    typecode, dtype = BINARY_FORMATS[fmt]
+    if np is not None:
+        if os.path.getsize(path) == 0:
+            return
+        values = np.memmap(path, dtype=dtype, mode='r')
+        for start in range(0, len(values), chunk_items):
+            yield values[start:start + chunk_items]
+        return
+    itemsize = array(typecode).itemsize
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(chunk_items * itemsize)
+            if not block:
+                return
+            chunk = array(typecode)
+            chunk.frombytes(block)
+            if _SWAP_BYTES:
+                chunk.byteswap()
+            yield chunk if typecode == 'q' else array('q', chunk)
+
+
+def iter_chunks(path, fmt=None, **options):
+    fmt = fmt or detect_format(path)
+    if fmt == "text":
+        return iter_text_chunks(path, **options)
+    return iter_binary_chunks(path, fmt, **options)
+
+
+def load(path, fmt=None):
+    """Load a whole dataset; fmt is "text", "int32" or "int64" (default: by extension)"""
+    fmt = fmt or detect_format(path)
+    if fmt != "text" and np is not None:
+        return np.fromfile(path, dtype=BINARY_FORMATS[fmt][1]).astype(np.int64, copy=False)
+    chunks = list(iter_chunks(path, fmt))
+    if np is not None:
+        return np.concatenate(chunks) if chunks else np.empty(0, dtype=np.int64)
+    values = array('q')
+    for chunk in chunks:
+        values.extend(chunk)
+    return values
+
+
+def save(path, values, fmt=None, separator="\n", block_items=1 << 16):
+    """Write values as text (joined by separator) or as raw int32/int64"""
+    fmt = fmt or detect_format(path)
+    if fmt == "text":
+        values = values.tolist() if hasattr(values, 'tolist') else list(values)
+        with open(path, 'w') as f:
+            for start in range(0, len(values), block_items):
+                f.write(separator.join(map(str, values[start:start + block_items])) + separator)
+        return
+    typecode, dtype = BINARY_FORMATS[fmt]
+    if np is not None:
+        np.asarray(values, dtype=dtype).tofile(path)
+    else:
+        values = array(typecode, values)
+        if _SWAP_BYTES:
+            values.byteswap()
+        with open(path, 'wb') as f:
+            values.tofile(f)
+
+
+def generate(distribution, n, seed=0, high=None, zipf_a=1.3):
+    """Seeded synthetic data; the NumPy and pure-Python streams differ for one seed"""
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution {distribution!r}")
+    high = high or n * 10 + 1
+    if np is not None:
+        rng = np.random.default_rng(seed)
+        if distribution == "few-unique":
+            return rng.integers(0, 8, n, dtype=np.int64)
+        if distribution == "zipf":
+            return np.minimum(rng.zipf(zipf_a, n), high).astype(np.int64)
+        values = rng.integers(0, high, n, dtype=np.int64)
+        if distribution in ("sorted", "reversed", "nearly-sorted"):
+            values.sort()
+        if distribution == "reversed":
+            values = values[::-1].copy()
+        elif distribution == "nearly-sorted" and n:
+            swaps = max(1, n // 100)
+            i, j = rng.integers(0, n, swaps), rng.integers(0, n, swaps)
+            values[i], values[j] = values[j], values[i].copy()
+        return values
+
+    rng = random.Random(seed)
+    if distribution == "few-unique":
+        return array('q', (rng.randrange(8) for _ in range(n)))
+    if distribution == "zipf":
+        # Inverse-CDF sampling of a bounded Zipf law over 1..high.
+        weights = [1 / k ** zipf_a for k in range(1, min(high, 100_000) + 1)]
+        return array('q', rng.choices(range(1, len(weights) + 1), weights=weights, k=n))
+    values = [rng.randrange(high) for _ in range(n)]
+    if distribution in ("sorted", "reversed", "nearly-sorted"):
+        values.sort(reverse=distribution == "reversed")
+    if distribution == "nearly-sorted" and n:
+        for _ in range(max(1, n // 100)):
+            i, j = rng.randrange(n), rng.randrange(n)
+            values[i], values[j] = values[j], values[i]
+    return array('q', values)
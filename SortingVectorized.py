@@ -0,0 +1,112 @@
+"""NumPy backends for bulk sorting.
+
+Every function sorts a one-dimensional integer array in place and returns
+the same {COMPARE, SWAP, WRITE} tallies as SortingEngine.count_operations,
+so both backends can be benchmarked side by side. Comparator networks count
+each element pair they compare, whether or not it is exchanged.
+"""
+import numpy as np
+
+from SortingEngine import COMPARE, SWAP, WRITE
+
+
+def _counts(compares=0, swaps=0, writes=0):
+    return {COMPARE: int(compares), SWAP: int(swaps), WRITE: int(writes)}
+
+
+def odd_even_sort(a):
+    """Odd-even transposition sort: alternate compare-exchange of (even, odd) and
+    (odd, even) neighbour pairs, each phase one vectorized step. Stops after two
+    phases in a row without an exchange."""
+    n = len(a)
+    compares = swaps = 0
+    quiet = 0
+    phase = 0
+    while quiet < 2 and n > 1:
+        start = phase & 1
+        pairs = (n - start) // 2
+        if pairs:
+            left = a[start:start + 2 * pairs:2]
+            right = a[start + 1:start + 2 * pairs:2]
+            out_of_order = left > right
+            exchanged = int(np.count_nonzero(out_of_order))
+            compares += pairs
+            if exchanged:
+                low = np.minimum(left, right)
+                right[...] = np.maximum(left, right)
+                left[...] = low
+                swaps += exchanged
+                quiet = 0
+            else:
+                quiet += 1
+        else:
+            quiet += 1
+        phase += 1
+    return _counts(compares, swaps)
+
+
+def bitonic_sort(a):
+    """Bitonic sorting network. The input is padded to a power of two with the
+    dtype's maximum, and each (k, j) stage runs as a single reshape-and-where pass."""
+    n = len(a)
+    if n < 2:
+        return _counts()
+    size = 1 << (n - 1).bit_length()
+    work = np.full(size, np.iinfo(a.dtype).max, dtype=a.dtype)
+    work[:n] = a
+    compares = swaps = 0
+    k = 2
+    while k <= size:
+        j = k // 2
+        while j:
+            pairs = work.reshape(-1, 2, j)
+            first, second = pairs[:, 0, :], pairs[:, 1, :]
+            # Block b holds indexes b*2j + t; its direction is bit k of b*2j.
+            ascending = ((np.arange(pairs.shape[0]) * 2 * j) & k == 0)[:, None]
+            low = np.minimum(first, second)
+            high = np.maximum(first, second)
+            swaps += int(np.count_nonzero(np.where(ascending, first > second, first < second)))
+            second[...] = np.where(ascending, high, low)
+            first[...] = np.where(ascending, low, high)
+            compares += size // 2
+            j //= 2
+        k *= 2
+    a[...] = work[:n]
+    return _counts(compares, swaps)
+
+
+def radix_sort(a, bits=16):
+    """LSD radix sort: per digit, np.bincount skips passes where every element
+    shares the digit, and a stable argsort of the digits does the scatter."""
+    n = len(a)
+    if n < 2:
+        return _counts()
+    low = a.min()
+    keys = (a.astype(np.int64) - np.int64(low)).astype(np.uint64)
+    top = int(keys.max())
+    mask = np.uint64((1 << bits) - 1)
+    digit_type = np.uint16 if bits <= 16 else np.uint32
+    writes = 0
+    shift = 0
+    while top >> shift:
+        digits = ((keys >> np.uint64(shift)) & mask).astype(digit_type)
+        if np.bincount(digits).max() < n:
+            keys = keys[np.argsort(digits, kind='stable')]
+            writes += n
+        shift += bits
+    a[...] = (keys.astype(np.int64) + np.int64(low)).astype(a.dtype)
+    return _counts(writes=writes)
+
+
+def numpy_sort(a):
+    """NumPy's own sort, as a reference point; it exposes no operation counts"""
+    a.sort()
+    return _counts()
+
+
+ALGORITHMS = {
+    "Odd-Even Transposition (numpy)": odd_even_sort,
+    "Bitonic Sort (numpy)": bitonic_sort,
+    "Radix Sort (numpy)": radix_sort,
+    "np.sort": numpy_sort,
+}